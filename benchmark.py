@@ -0,0 +1,605 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+from test4 import (MEDIA_CACHE_BYTES, MEDIA_MAX_HEIGHT, MEDIA_MAX_WIDTH, AnswerKey, KioskDatabase, MediaCache, Question, QuizDatabase,
+                   QuizSession, ResponseBuffer, decode_attachment, grade_submission_file, grade_submissions, load_pil, read_question_file)
+
+WORDS = ("asset liability equity revenue expense cash flow ledger journal balance inflation demand supply "
+         "market price index query table join schema normal form key entity relation model forecast "
+         "regression variance sample mean median trend margin budget capital interest").split()
+
+SYLLABLES = "ba be bi bo bu ca ce ci co cu da de di do du fa fe fi fo fu ga ge gi go gu la le li lo lu ma me mi mo mu na ne ni no nu ra re ri ro ru sa se si so su ta te ti to tu".split()
+
+def build_vocabulary(size=5000, seed=0):
+    rng = random.Random(seed)
+    vocabulary = list(WORDS)
+    seen = set(vocabulary)
+    while len(vocabulary) < size:
+        word = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+def generate_questions(count, category_count=20, seed=0):
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(seed=seed)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    words = lambda k: " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=k))
+    
+    for i in range(count):
+        options = [words(4) + f" {i}-{letter}" for letter in "abcd"]
+        is_multiple_choice = rng.random() < 0.3
+        answers = rng.sample(options, rng.randint(2, 3)) if is_multiple_choice else [rng.choice(options)]
+        yield {
+            "category": f"Category {i % category_count:03d}",
+            "question": words(12) + "?",
+            "options": options,
+            "answers": answers,
+            "is_multiple_choice": is_multiple_choice,
+            "feedback": words(8) if rng.random() < 0.5 else ""
+        }
+
+def timed(function, repeat=1):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, samples
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "mean_ms": round(statistics.mean(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+    }
+
+def bench_calls(name, function, arguments):
+    samples = []
+    for args in arguments:
+        _, sample = timed(lambda: function(*args))
+        samples.extend(sample)
+    return {name: summarize(samples)}
+
+def write_synthetic_bank(path, size, categories, seed):
+    with open(path, "w", encoding="utf-8") as f:
+        for question in generate_questions(size, categories, seed):
+            f.write(json.dumps(question) + "\n")
+
+def bench_bulk_load(db, path):
+    imported, samples = timed(lambda: db.import_questions(read_question_file(path)))
+    result = summarize(samples)
+    result["rows_per_sec"] = round(imported / (samples[0] / 1000))
+    return {"bulk_load": result}
+
+def bench_add_question(db, rng, categories, repeat):
+    questions = list(generate_questions(repeat, categories, rng.random()))
+    return bench_calls("add_question", db.add_question,
+                       [(q["category"], q["question"], q["options"], q["answers"], q["is_multiple_choice"], q["feedback"])
+                        for q in questions])
+
+def count_categories_uncached(db):
+    db._category_counts = None
+    return db.get_category_counts()
+
+def bench_reads(db, rng, category_names, repeat):
+    results = {}
+    results.update(bench_calls("get_categories", db.get_categories, [()] * repeat))
+    results.update(bench_calls("get_category_counts_cold", count_categories_uncached, [(db,)] * min(repeat, 20)))
+    results.update(bench_calls("get_category_counts", db.get_category_counts, [()] * repeat))
+    results.update(bench_calls("poll_changes", db.poll_changes, [()] * repeat))
+    results.update(bench_calls("get_questions_by_category", db.get_questions_by_category,
+                               [(rng.choice(category_names),) for _ in range(min(repeat, 20))]))
+    results.update(bench_calls("get_all_questions", db.get_all_questions, [()] * 3))
+    return results
+
+def bench_writes(db, rng, category_names, repeat):
+    question_ids = []
+    for name in category_names:
+        question_ids.extend(db.get_category_question_ids(name))
+    targets = rng.sample(question_ids, min(repeat * 2, len(question_ids)))
+    updates, deletes = targets[:len(targets) // 2], targets[len(targets) // 2:]
+    
+    results = {}
+    results.update(bench_calls("update_question", db.update_question,
+                               [(question_id, f"Updated question {question_id}?", ["w", "x", "y", "z"], ["x"], False, "")
+                                for question_id in updates]))
+    results.update(bench_calls("delete_question", db.delete_question, [(question_id,) for question_id in deletes]))
+    return results
+
+def run_quiz_session(db, rng, category, length):
+    session = QuizSession(db.sample_questions(category, length, seed=rng.random()))
+    while not session.finished:
+        question = session.next_question()
+        if question.is_multiple_choice:
+            session.submit(rng.sample(question.options, rng.randint(1, len(question.options))))
+        else:
+            session.submit([rng.choice(question.options)])
+    return session
+
+def bench_quiz_sessions(db, rng, category_names, repeat, length=20):
+    return bench_calls("quiz_session", run_quiz_session,
+                       [(db, rng, rng.choice(category_names), length) for _ in range(repeat)])
+
+def bench_scheduler(db, rng, category, students=5, days=10, length=20):
+    clock = [time.time()]
+    samples = []
+    daily_scores = []
+    learned = [set() for _ in range(students)]
+    
+    for day in range(days):
+        correct = answered = 0
+        for student in range(students):
+            questions = db.schedule_questions(category, length, f"student-{student}", clock=lambda: clock[0])
+            session = QuizSession(questions, scheduler=questions)
+            while not session.finished:
+                begin = time.perf_counter()
+                question = session.next_question()
+                samples.append((time.perf_counter() - begin) * 1000)
+                if question.id in learned[student] and rng.random() < 0.95:
+                    answers = question.correct_answers
+                else:
+                    answers = [rng.choice(question.options)]
+                    if rng.random() < 0.7:
+                        learned[student].add(question.id)
+                correct += session.submit(answers)
+                answered += 1
+            questions.flush()
+        daily_scores.append(correct / answered if answered else 0.0)
+        clock[0] += 86400
+    
+    results = {"scheduler_pick": summarize(samples)}
+    results["scheduler_pick"]["first_day_accuracy"] = round(daily_scores[0], 3)
+    results["scheduler_pick"]["last_day_accuracy"] = round(daily_scores[-1], 3)
+    return results
+
+LEGACY_QUESTION_SQL = '''
+SELECT c.name, q.id, q.question_text, q.option_a, q.option_b, q.option_c, q.option_d, q.correct_answers, q.is_multiple_choice, q.feedback,
+       IFNULL(s.attempts, 0), IFNULL(100.0 * s.correct / s.attempts, -1), IFNULL(1.0 * s.total_ms / s.attempts, -1)
+FROM questions q JOIN categories c ON q.category_id = c.id
+LEFT JOIN question_stats s ON s.question_id = q.id
+WHERE q.id = ?
+'''
+
+def load_legacy_question(conn, question_id):
+    return load_legacy_row(conn.execute(LEGACY_QUESTION_SQL, (question_id,)).fetchone())
+
+def load_legacy_row(row):
+    return {
+        "category": row[0],
+        "id": row[1],
+        "question": row[2],
+        "options": [row[3], row[4], row[5], row[6]],
+        "answers": json.loads(row[7]) if row[7].startswith('[') else [row[7]],
+        "is_multiple_choice": bool(row[8]),
+        "feedback": row[9] or "",
+        "attempts": row[10],
+        "percent_correct": row[11],
+        "avg_ms": row[12]
+    }
+
+def grade_legacy(question, user_answers):
+    if not user_answers:
+        return None
+    if question["is_multiple_choice"]:
+        return set(user_answers) == set(question["answers"])
+    return user_answers[0] in question["answers"]
+
+def bench_answer_encoding(db, rng, category_names, count=2000, grades=100000):
+    category_ids = db.get_category_question_ids(category_names[0])
+    question_ids = rng.sample(category_ids, min(count, len(category_ids)))
+    conn = db._get_connection()
+    
+    legacy, legacy_samples = timed(lambda: [load_legacy_question(conn, question_id) for question_id in question_ids])
+    current, current_samples = timed(lambda: [Question(db.get_question_by_id(question_id)) for question_id in question_ids])
+    
+    legacy_page_sql = LEGACY_QUESTION_SQL.replace("WHERE q.id = ?", "WHERE q.id > ? ORDER BY q.id LIMIT ?")
+    page_starts = [min(question_ids) + step * 10 for step in range(20)]
+    _, legacy_page_samples = timed(lambda: [[load_legacy_row(row) for row in conn.execute(legacy_page_sql, (start, 200))]
+                                            for start in page_starts])
+    _, page_samples = timed(lambda: [db.get_questions_page(after_id=start, limit=200) for start in page_starts])
+    
+    answer_sets = []
+    for _ in range(grades):
+        index = rng.randrange(len(question_ids))
+        options = current[index].options
+        answers = rng.sample(options, rng.randint(1, len(options))) if current[index].is_multiple_choice else [rng.choice(options)]
+        answer_sets.append((index, answers, current[index].answer_mask(answers)))
+    
+    legacy_grades, legacy_grade_samples = timed(lambda: [grade_legacy(legacy[index], answers) for index, answers, mask in answer_sets])
+    current_grades, current_grade_samples = timed(lambda: [current[index].validate_answers(answers) for index, answers, mask in answer_sets])
+    mask_grades, mask_grade_samples = timed(lambda: [current[index].validate_mask(mask) for index, answers, mask in answer_sets])
+    
+    per_sec = lambda items, samples: round(items / (samples[0] / 1000), 1)
+    return {"answer_encoding": {
+        "questions": len(question_ids),
+        "load_legacy_per_sec": per_sec(len(question_ids), legacy_samples),
+        "load_per_sec": per_sec(len(question_ids), current_samples),
+        "page_legacy_per_sec": per_sec(len(page_starts) * 200, legacy_page_samples),
+        "page_per_sec": per_sec(len(page_starts) * 200, page_samples),
+        "grades": grades,
+        "grade_legacy_per_sec": per_sec(grades, legacy_grade_samples),
+        "grade_answers_per_sec": per_sec(grades, current_grade_samples),
+        "grade_mask_per_sec": per_sec(grades, mask_grade_samples),
+        "grade_mismatches": sum(a != b or a != c for a, b, c in zip(legacy_grades, current_grades, mask_grades)),
+    }}
+
+def bench_response_writes(db, rng, category_names, responses, window=10000):
+    question_ids = db.get_category_question_ids(category_names[0])
+    attempt_id = db.start_attempt(category_names[0])
+    results = {}
+    
+    with ResponseBuffer(db, flush_interval=0.05) as buffer:
+        for start in range(0, responses, window):
+            samples = []
+            for _ in range(min(window, responses - start)):
+                question_id = rng.choice(question_ids)
+                begin = time.perf_counter()
+                buffer.add_response(attempt_id, question_id, ["x"], rng.random() < 0.5, rng.randint(500, 30000))
+                samples.append((time.perf_counter() - begin) * 1000)
+            if start == 0:
+                results["submit_first_window"] = summarize(samples)
+        results["submit_last_window"] = summarize(samples)
+    
+    total = db._get_connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    results["submit_last_window"]["responses_stored"] = total
+    return results
+
+def bench_search(db, seed=0, repeat=200):
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(seed=seed)[:1000]
+    queries = [" ".join(rng.sample(vocabulary, rng.randint(1, 2))) for _ in range(repeat)]
+    queries += [word[:4] for word in rng.choices(vocabulary, k=repeat)]
+    
+    results = {}
+    results.update(bench_calls("search_words", db.search, [(query,) for query in queries[:repeat]]))
+    results.update(bench_calls("search_prefix", db.search, [(query,) for query in queries[repeat:]]))
+    return results
+
+def bench_duplicates(db, rng, category_names, repeat):
+    question_ids = db.get_category_question_ids(rng.choice(category_names))
+    questions = [db.get_question_by_id(question_id) for question_id in rng.sample(question_ids, min(repeat, len(question_ids)))]
+    results = bench_calls("find_similar_questions", db.find_similar_questions,
+                          [(question["question"], question["options"], question["id"]) for question in questions])
+    _, samples = timed(db.find_duplicate_questions)
+    results["find_duplicate_questions"] = summarize(samples)
+    return results
+
+def write_submission_file(path, key, rng, count, students=2000):
+    records = []
+    for _ in range(count):
+        question = rng.choice(key.questions)
+        roll = rng.random()
+        if roll < 0.05:
+            answers = []
+        elif roll < 0.5:
+            answers = question.correct_answers
+        else:
+            answers = rng.sample(question.options, rng.randint(1, len(question.options)))
+        records.append({"student": f"student-{rng.randrange(students)}", "question_id": question.id, "answers": "|".join(answers)})
+    
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, ["student", "question_id", "answers"])
+        writer.writeheader()
+        writer.writerows(records)
+    return records
+
+def grade_loop(key, records):
+    students = {}
+    items = {}
+    for record in records:
+        question = key.questions[key.index[int(record["question_id"])]]
+        result = question.validate_answers(record["answers"].split("|") if record["answers"] else [])
+        for totals in (students.setdefault(record["student"], [0, 0, 0]), items.setdefault(question.id, [0, 0, 0])):
+            totals[0] += 1
+            totals[1] += bool(result)
+            totals[2] += result is None
+    return students, items
+
+def count_mismatches(expected, report):
+    students, items = expected
+    return (sum(students.get(student["student"]) != [student["questions"], student["correct"], student["unanswered"]]
+                for student in report["students"]) +
+            sum(items.get(item["id"]) != [item["responses"], item["correct"], item["unanswered"]] for item in report["items"]) +
+            abs(len(students) - len(report["students"])) + abs(len(items) - len(report["items"])))
+
+def bench_batch_grading(db, rng, directory, submissions=200000):
+    key = AnswerKey.from_database(db)
+    path = os.path.join(directory, "submissions.csv")
+    records = write_submission_file(path, key, rng, submissions)
+    
+    expected, loop_samples = timed(lambda: grade_loop(key, records), 3)
+    runs = {
+        "numpy": lambda: grade_submissions(key, records),
+        "python": lambda: grade_submissions(key, records, use_numpy=False),
+        "file": lambda: grade_submission_file(key, path, workers=1),
+        "file_pool": lambda: grade_submission_file(key, path),
+    }
+    
+    per_sec = lambda samples: round(submissions / (min(samples) / 1000), 1)
+    results = {"answers": submissions, "workers": os.cpu_count(), "loop_per_sec": per_sec(loop_samples)}
+    for name, run in runs.items():
+        report, samples = timed(run, 3)
+        results[f"{name}_per_sec"] = per_sec(samples)
+        results[f"{name}_speedup"] = round(min(loop_samples) / min(samples), 2)
+        results[f"{name}_mismatches"] = count_mismatches(expected, report)
+    return {"batch_grading": results}
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def make_png(width, height, seed):
+    rows = b"".join(b"\x00" + bytes([seed % 256, y % 256, (seed * 7 + y) % 256]) * width for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)) +
+            png_chunk(b"IDAT", zlib.compress(rows)) + png_chunk(b"IEND", b""))
+
+def bench_media(db, rng, category_names, count=50, width=1600, height=900, views=2000):
+    if not load_pil():
+        width, height = min(width, MEDIA_MAX_WIDTH), min(height, MEDIA_MAX_HEIGHT)
+    question_ids = db.get_category_question_ids(category_names[0])
+    question_ids = rng.sample(question_ids, min(count, len(question_ids)))
+    attachment_ids = [db.add_attachment(question_id, make_png(width, height, index)) for index, question_id in enumerate(question_ids)]
+    
+    results = bench_calls("get_question_by_id_with_media", db.get_question_by_id, [(question_id,) for question_id in question_ids])
+    decoded = {}
+    results.update(bench_calls("decode_attachment", lambda attachment_id: decoded.__setitem__(attachment_id, decode_attachment(db, attachment_id)),
+                               [(attachment_id,) for attachment_id in attachment_ids]))
+    
+    cache = MediaCache(MEDIA_CACHE_BYTES // 16)
+    hits = peak = 0
+    for _ in range(views):
+        attachment_id = rng.choice(attachment_ids)
+        if attachment_id in cache:
+            cache.get(attachment_id)
+            hits += 1
+        else:
+            size = decoded[attachment_id][1]
+            cache.put(attachment_id, None, size[0] * size[1] * 4)
+        peak = max(peak, cache.size)
+    
+    results["media_cache"] = {"pillow": bool(load_pil()), "images": len(attachment_ids), "max_bytes": cache.max_bytes,
+                              "peak_bytes": peak, "hit_rate": round(hits / views, 3)}
+    return results
+
+def run_benchmarks(size, categories, seed, repeat, directory, responses=200000, render=False):
+    rng = random.Random(seed)
+    results = {}
+    
+    bank_path = os.path.join(directory, f"bank_{size}.jsonl")
+    write_synthetic_bank(bank_path, size, categories, seed)
+    
+    with QuizDatabase(os.path.join(directory, f"bench_{size}.db")) as db:
+        results.update(bench_bulk_load(db, bank_path))
+        category_names = db.get_categories()
+        results.update(bench_add_question(db, rng, categories, repeat))
+        results.update(bench_reads(db, rng, category_names, repeat))
+        results.update(bench_search(db, seed, repeat))
+        results.update(bench_duplicates(db, rng, category_names, repeat))
+        results.update(bench_quiz_sessions(db, rng, category_names, repeat))
+        results.update(bench_scheduler(db, rng, category_names[0]))
+        results.update(bench_answer_encoding(db, rng, category_names))
+        results.update(bench_writes(db, rng, category_names, repeat))
+        results.update(bench_response_writes(db, rng, category_names, responses))
+        results.update(bench_batch_grading(db, rng, directory))
+        results.update(bench_media(db, rng, category_names))
+        full_scans = db.find_full_scans()
+    
+    results.update(bench_startup(os.path.join(directory, f"bench_{size}.db"), directory, render=render))
+    results.update(bench_kiosk(os.path.join(directory, f"bench_{size}.db"), rng, repeat))
+    return {"results": results, "full_scans": full_scans}
+
+STARTUP_SCRIPT = '''
+import json, sys, time
+started = float(sys.argv[1])
+timings = {"interpreter_ms": (time.time() - started) * 1000}
+import test4
+timings["import_ms"] = (time.time() - started) * 1000
+if sys.argv[3] == "welcome":
+    try:
+        root = test4.load_tk().Tk()
+    except test4.tk.TclError as e:
+        print(json.dumps({"skipped": str(e)}))
+        sys.exit()
+    app = test4.QuizApp(root, db=test4.QuizDatabase(sys.argv[2]))
+    root.update()
+    timings["welcome_ms"] = (time.time() - started) * 1000
+    app.on_close()
+else:
+    db = test4.QuizDatabase(sys.argv[2])
+    timings["open_ms"] = (time.time() - started) * 1000
+    db.get_categories()
+    timings["first_query_ms"] = (time.time() - started) * 1000
+print(json.dumps(timings))
+'''
+
+def run_startup(db_file, mode):
+    started = time.time()
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, repr(started), db_file, mode],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.PIPE,
+                            universal_newlines=True, check=True).stdout
+    return json.loads(output)
+
+def bench_startup(db_file, directory, repeat=10, render=False):
+    modes = [("startup", db_file, "query")]
+    if render:
+        modes.append(("startup_welcome", db_file, "welcome"))
+    run_startup(db_file, "query")
+    
+    results = {}
+    for name, path, mode in modes:
+        runs = [run_startup(path, mode) for _ in range(repeat)]
+        if "skipped" in runs[0]:
+            results[name] = runs[0]
+            continue
+        for key in runs[0]:
+            results[f"{name}_{key[:-3]}"] = summarize([run[key] for run in runs])
+    
+    new_runs = [run_startup(os.path.join(directory, f"startup_{i}.db"), "query") for i in range(repeat)]
+    results["startup_new_database_first_query"] = summarize([run["first_query_ms"] for run in new_runs])
+    return results
+
+def start_quiz(db, rng, category_names, length=20):
+    category = rng.choice(category_names)
+    session = QuizSession(db.sample_questions(category, length, seed=rng.random()), attempt_id=db.start_attempt(category, "kiosk"))
+    session.next_question()
+    return session
+
+def bench_kiosk(db_file, rng, repeat):
+    results = {}
+    for name, factory in (("disk", QuizDatabase), ("kiosk", lambda path: KioskDatabase(path, flush_interval=3600))):
+        db, samples = timed(lambda: factory(db_file))
+        results[f"{name}_open"] = summarize(samples)
+        with db:
+            category_names = db.get_categories()
+            results.update(bench_calls(f"{name}_quiz_start", start_quiz,
+                                       [(db, rng, category_names) for _ in range(repeat)]))
+            if name == "kiosk":
+                _, samples = timed(db.flush)
+                results["kiosk_flush"] = summarize(samples)
+    return results
+
+def check_query_plans(directory, size=200, categories=5, seed=0):
+    bank_path = os.path.join(directory, "plans.jsonl")
+    write_synthetic_bank(bank_path, size, categories, seed)
+    with QuizDatabase(os.path.join(directory, "plans.db")) as db:
+        db.import_questions(read_question_file(bank_path))
+        return db.find_full_scans()
+
+def find_regressions(report, baseline, threshold):
+    regressions = []
+    for size, run in report["sizes"].items():
+        baseline_results = baseline.get("sizes", {}).get(size, {}).get("results", {})
+        for name, result in run["results"].items():
+            previous = baseline_results.get(name)
+            if previous and "p50_ms" in result and result["p50_ms"] > previous["p50_ms"] * (1 + threshold):
+                regressions.append(f"{name} at {size} questions: p50 {previous['p50_ms']}ms -> {result['p50_ms']}ms")
+        for name, scans in run["full_scans"].items():
+            regressions.append(f"{name} at {size} questions uses a full table scan: {', '.join(scans)}")
+    return regressions
+
+def rebuild_question_widgets(tk, root, frame, question, progress_text):
+    if frame is not None:
+        frame.destroy()
+    frame = tk.Frame(root, padx=20, pady=20)
+    frame.pack(fill=tk.BOTH, expand=True)
+    
+    tk.Label(frame, text=progress_text, font=("Arial", 12)).pack(pady=10)
+    tk.Label(frame, text=question.question_text, font=("Arial", 16), wraplength=700).pack(pady=20)
+    choice_type = "Multiple answers allowed" if question.is_multiple_choice else "Select one answer"
+    tk.Label(frame, text=choice_type, font=("Arial", 12, "italic")).pack(pady=5)
+    
+    options_frame = tk.Frame(frame)
+    options_frame.pack(pady=10, fill=tk.X)
+    answer_var = tk.StringVar()
+    for option in question.options:
+        if question.is_multiple_choice:
+            tk.Checkbutton(options_frame, text=option, font=("Arial", 14), variable=tk.BooleanVar(),
+                           padx=10, pady=5).pack(anchor=tk.W)
+        else:
+            tk.Radiobutton(options_frame, text=option, font=("Arial", 14), variable=answer_var, value=option,
+                           padx=10, pady=5).pack(anchor=tk.W)
+    
+    tk.Button(frame, text="Submit Answer", font=("Arial", 14), padx=10, pady=5).pack(pady=20)
+    return frame
+
+def bench_render(count=200, seed=0):
+    import tkinter as tk
+    from test4 import Question, QuizView
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {"skipped": str(e)}
+    
+    root.geometry("800x600")
+    questions = [Question(q) for q in generate_questions(count, seed=seed)]
+    results = {}
+    
+    frame = None
+    samples = []
+    for i, question in enumerate(questions):
+        start = time.perf_counter()
+        frame = rebuild_question_widgets(tk, root, frame, question, f"Question {i + 1} of {count}")
+        root.update()
+        samples.append((time.perf_counter() - start) * 1000)
+    results["render_rebuild"] = summarize(samples)
+    frame.destroy()
+    
+    frame = tk.Frame(root, padx=20, pady=20)
+    frame.pack(fill=tk.BOTH, expand=True)
+    quiz_view = QuizView(frame, lambda: None)
+    samples = []
+    for i, question in enumerate(questions):
+        start = time.perf_counter()
+        quiz_view.show(question, f"Question {i + 1} of {count}")
+        root.update()
+        samples.append((time.perf_counter() - start) * 1000)
+    results["render_reuse"] = summarize(samples)
+    
+    root.destroy()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark QuizDatabase on a synthetic question bank.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--responses", type=int, default=200000, help="quiz responses to record through the write-behind buffer")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="compare against a previous JSON report")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown against the baseline")
+    parser.add_argument("--render", action="store_true", help="also time quiz question rendering (needs a display)")
+    parser.add_argument("--check-plans", action="store_true", help="only check that indexed queries avoid full table scans")
+    args = parser.parse_args()
+    
+    if args.check_plans:
+        with tempfile.TemporaryDirectory() as directory:
+            full_scans = check_query_plans(directory, seed=args.seed)
+        for name, scans in full_scans.items():
+            print(f"FULL SCAN: {name} uses a full table scan: {', '.join(scans)}", file=sys.stderr)
+        sys.exit(1 if full_scans else 0)
+    
+    report = {"categories": args.categories, "seed": args.seed, "repeat": args.repeat, "sizes": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            report["sizes"][str(size)] = run_benchmarks(size, args.categories, args.seed, args.repeat, directory,
+                                                        args.responses, args.render)
+    
+    if args.render:
+        report["render"] = bench_render(seed=args.seed)
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = find_regressions(report, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
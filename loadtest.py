@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark import summarize, write_synthetic_bank
+from quiz_server import QuizServer
+from test4 import QuizDatabase, QuizSession, RemoteQuizDatabase, ResponseBuffer, read_question_file
+
+class TimedRemoteQuizDatabase(RemoteQuizDatabase):
+    def __init__(self, url, samples, lock):
+        super().__init__(url)
+        self.samples = samples
+        self.lock = lock
+    
+    def call(self, name, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().call(name, *args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self.lock:
+                self.samples.setdefault(name, []).append(elapsed_ms)
+
+def run_client(url, client, quizzes, length, seed, start_barrier, samples, errors, lock):
+    rng = random.Random(seed * 100003 + client)
+    start_barrier.wait()
+    
+    with TimedRemoteQuizDatabase(url, samples, lock) as db, ResponseBuffer(db) as buffer:
+        try:
+            categories = db.get_categories()
+            for _ in range(quizzes):
+                category = rng.choice(categories)
+                questions = db.sample_questions(category, length, seed=rng.random())
+                session = QuizSession(questions, buffer, db.start_attempt(category, f"client-{client}"))
+                while not session.finished:
+                    question = session.next_question()
+                    if rng.random() < 0.6:
+                        session.submit(question.correct_answers)
+                    else:
+                        session.submit([rng.choice(question.options)])
+        except Exception as e:
+            with lock:
+                errors.append(f"client {client}: {e!r}")
+
+def run_load_test(url, clients, quizzes, length, seed):
+    samples = {}
+    errors = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(clients + 1)
+    threads = [threading.Thread(target=run_client, name=f"client-{client}",
+                                args=(url, client, quizzes, length, seed, start_barrier, samples, errors, lock))
+               for client in range(clients)]
+    for thread in threads:
+        thread.start()
+    
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    requests = sum(len(values) for values in samples.values())
+    return {
+        "clients": clients,
+        "quizzes_per_client": quizzes,
+        "questions_per_quiz": length,
+        "elapsed_s": round(elapsed, 3),
+        "requests": requests,
+        "requests_per_sec": round(requests / elapsed, 1) if elapsed else None,
+        "errors": len(errors),
+        "first_errors": errors[:10],
+        "calls": {name: summarize(values) for name, values in sorted(samples.items())},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many quiz clients against a quiz server.")
+    parser.add_argument("--url", help="existing quiz server to test (default: start a local one)")
+    parser.add_argument("--db", help="database file to copy and serve (default: a synthetic question bank)")
+    parser.add_argument("--size", type=int, default=10000, help="questions in the synthetic question bank")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--quizzes", type=int, default=3, help="quizzes taken by every client")
+    parser.add_argument("--length", type=int, default=10, help="questions per quiz")
+    parser.add_argument("--readers", type=int, default=4, help="read connections used by the local server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+    
+    if args.url:
+        report = run_load_test(args.url, args.clients, args.quizzes, args.length, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            db_file = os.path.join(directory, "loadtest.db")
+            if args.db:
+                shutil.copyfile(args.db, db_file)
+            else:
+                bank_path = os.path.join(directory, "questions.jsonl")
+                write_synthetic_bank(bank_path, args.size, args.categories, args.seed)
+                with QuizDatabase(db_file) as db:
+                    db.import_questions(read_question_file(bank_path))
+            
+            with QuizServer(db_file, port=0, readers=args.readers) as server:
+                server.start()
+                report = run_load_test(server.url, args.clients, args.quizzes, args.length, args.seed)
+                conn = server.db._get_connection()
+                report["responses_stored"] = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                report["attempts_finished"] = conn.execute("SELECT COUNT(*) FROM attempts WHERE finished_at IS NOT NULL").fetchone()[0]
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    
+    if report["errors"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import base64
+import concurrent.futures
+import http.server
+import json
+import socketserver
+import threading
+import time
+
+from test4 import (CHANGE_POLL_MS, SERVER_PORT, SERVER_READ_METHODS, SERVER_READERS, SERVER_WRITE_METHODS,
+                   DatabaseWorker, QuizDatabase)
+
+def encode_json(value):
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Cannot send {type(value).__name__} values")
+
+class QuizRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_POST(self):
+        if not self.path.startswith("/call/"):
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            result = self.server.quiz_server.call(self.path[len("/call/"):], request.get("args", []),
+                                                  request.get("kwargs", {}))
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            self.send_json(400, {"error": str(e)})
+        except Exception as e:
+            self.send_json(500, {"error": str(e) or type(e).__name__})
+        else:
+            self.send_json(200, {"result": result})
+    
+    def send_json(self, status, payload):
+        try:
+            body = json.dumps(payload, default=encode_json).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            status = 500
+            body = json.dumps({"error": f"Cannot send the result: {e}"}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        if self.server.quiz_server.verbose:
+            super().log_message(format, *args)
+
+class ThreadingQuizHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+class QuizServer:
+    def __init__(self, db_file="quiz_database.db", host="127.0.0.1", port=SERVER_PORT, readers=SERVER_READERS, verbose=False):
+        self.db = QuizDatabase(db_file)
+        self.read_db = QuizDatabase(db_file, read_only=True)
+        self.writer = DatabaseWorker(self.db)
+        self.readers = concurrent.futures.ThreadPoolExecutor(max_workers=readers, thread_name_prefix="quiz-read")
+        self.verbose = verbose
+        self.changes_polled_at = 0
+        self.httpd = ThreadingQuizHTTPServer((host, port), QuizRequestHandler)
+        self.httpd.quiz_server = self
+        self._thread = None
+    
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+    
+    def call(self, name, args, kwargs):
+        if name in SERVER_READ_METHODS:
+            future = self.readers.submit(self.read, name, args, kwargs)
+        elif name in SERVER_WRITE_METHODS:
+            future = self.writer.submit(getattr(self.db, name), *args, **kwargs)
+        else:
+            raise ValueError(f"Unknown method {name!r}")
+        return future.result()
+    
+    def read(self, name, args, kwargs):
+        now = time.monotonic()
+        if now - self.changes_polled_at >= CHANGE_POLL_MS / 1000:
+            self.changes_polled_at = now
+            self.read_db.poll_changes()
+        return getattr(self.read_db, name)(*args, **kwargs)
+    
+    def serve_forever(self):
+        self.httpd.serve_forever()
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="quiz-server", daemon=True)
+        self._thread.start()
+        return self
+    
+    def close(self):
+        if self._thread:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown()
+        self.read_db.close()
+        self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
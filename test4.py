@@ -1,657 +1,3832 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import sqlite3
-import random
-import json
-
-class Question:
-    def __init__(self, question_data):
-        self.question_text = question_data["question"]
-        self.options = question_data["options"]
-        self.correct_answers = question_data["answers"]
-        self.is_multiple_choice = question_data["is_multiple_choice"]
-        self.feedback = question_data["feedback"]
-        self.selected_answers = []
-    
-    def create_widgets(self, parent_frame):
-        tk.Label(parent_frame, text=self.question_text, font=("Arial", 16), wraplength=700).pack(pady=20)
-        
-        choice_type = "Multiple answers allowed" if self.is_multiple_choice else "Select one answer"
-        tk.Label(parent_frame, text=choice_type, font=("Arial", 12, "italic")).pack(pady=5)
-        
-        options_frame = tk.Frame(parent_frame)
-        options_frame.pack(pady=10, fill=tk.X)
-        
-        if self.is_multiple_choice:
-            self.option_vars = []
-            for option in self.options:
-                var = tk.BooleanVar()
-                self.option_vars.append((var, option))
-                tk.Checkbutton(options_frame, text=option, font=("Arial", 14),
-                              variable=var, padx=10, pady=5).pack(anchor=tk.W)
-        else:
-            answer_var = tk.StringVar()
-            self.option_vars = answer_var
-            for option in self.options:
-                tk.Radiobutton(options_frame, text=option, font=("Arial", 14),
-                              variable=answer_var, value=option, padx=10, pady=5).pack(anchor=tk.W)
-        
-        return options_frame
-    
-    def get_user_answers(self):
-        user_answers = []
-        
-        if self.is_multiple_choice:
-            for var, option in self.option_vars:
-                if var.get():
-                    user_answers.append(option)
-        else:
-            if self.option_vars.get():
-                user_answers = [self.option_vars.get()]
-                
-        return user_answers
-    
-    def validate_answers(self, user_answers):
-        if not user_answers:
-            return None
-            
-        if self.is_multiple_choice:
-            is_correct = set(user_answers) == set(self.correct_answers)
-        else:
-            is_correct = user_answers[0] in self.correct_answers
-            
-        return is_correct
-
-class QuizDatabase:
-    def __init__(self, db_file="quiz_database.db"):
-        self.db_file = db_file
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL
-        )''')
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS questions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category_id INTEGER NOT NULL,
-            question_text TEXT NOT NULL,
-            option_a TEXT NOT NULL,
-            option_b TEXT NOT NULL,
-            option_c TEXT NOT NULL,
-            option_d TEXT NOT NULL,
-            correct_answers TEXT NOT NULL,
-            is_multiple_choice BOOLEAN NOT NULL DEFAULT 0,
-            feedback TEXT,
-            FOREIGN KEY (category_id) REFERENCES categories (id)
-        )''')
-        
-        cursor.execute("PRAGMA table_info(questions)")
-        columns = [info[1] for info in cursor.fetchall()]
-        
-        if "feedback" not in columns:
-            cursor.execute("ALTER TABLE questions ADD COLUMN feedback TEXT")
-        
-        if "correct_answer" in columns and "correct_answers" not in columns:
-            self._migrate_database(conn, cursor)
-        
-        conn.commit()
-        conn.close()
-    
-    def _migrate_database(self, conn, cursor):
-        cursor.execute("ALTER TABLE questions ADD COLUMN correct_answers TEXT")
-        cursor.execute("ALTER TABLE questions ADD COLUMN is_multiple_choice BOOLEAN NOT NULL DEFAULT 0")
-        
-        cursor.execute("UPDATE questions SET correct_answers = correct_answer, is_multiple_choice = 0")
-        
-        cursor.execute("CREATE TABLE questions_new AS SELECT id, category_id, question_text, option_a, option_b, option_c, option_d, correct_answers, is_multiple_choice, feedback FROM questions")
-        cursor.execute("DROP TABLE questions")
-        cursor.execute("ALTER TABLE questions_new RENAME TO questions")
-        
-        conn.commit()
-    
-    def get_categories(self):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM categories")
-        categories = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return categories
-    
-    def add_category(self, category_name):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        try:
-            cursor.execute("INSERT INTO categories (name) VALUES (?)", (category_name,))
-            conn.commit()
-            success = True
-        except sqlite3.IntegrityError:
-            success = False
-        conn.close()
-        return success
-    
-    def get_category_id(self, category_name):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM categories WHERE name = ?", (category_name,))
-        result = cursor.fetchone()
-        conn.close()
-        return result[0] if result else None
-    
-    def add_question(self, category_name, question_text, options, correct_answers, is_multiple_choice, feedback=""):
-        category_id = self.get_category_id(category_name)
-        if not category_id:
-            self.add_category(category_name)
-            category_id = self.get_category_id(category_name)
-        
-        correct_answers_json = json.dumps(correct_answers)
-        
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute('''
-        INSERT INTO questions (category_id, question_text, option_a, option_b, option_c, option_d, correct_answers, is_multiple_choice, feedback)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (category_id, question_text, options[0], options[1], options[2], options[3], correct_answers_json, is_multiple_choice, feedback))
-        conn.commit()
-        conn.close()
-    
-    def get_questions_by_category(self, category_name):
-        category_id = self.get_category_id(category_name)
-        if not category_id:
-            return []
-        
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute('''
-        SELECT question_text, option_a, option_b, option_c, option_d, correct_answers, is_multiple_choice, feedback
-        FROM questions WHERE category_id = ?
-        ''', (category_id,))
-        
-        questions = []
-        for row in cursor.fetchall():
-            correct_answers = json.loads(row[5]) if row[5].startswith('[') else [row[5]]
-            questions.append({
-                "question": row[0],
-                "options": [row[1], row[2], row[3], row[4]],
-                "answers": correct_answers,
-                "is_multiple_choice": bool(row[6]),
-                "feedback": row[7] or ""
-            })
-        
-        conn.close()
-        return questions
-    
-    def get_all_questions(self):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute('''
-        SELECT c.name, q.id, q.question_text, q.option_a, q.option_b, q.option_c, q.option_d, q.correct_answers, q.is_multiple_choice, q.feedback
-        FROM questions q JOIN categories c ON q.category_id = c.id
-        ''')
-        
-        questions = []
-        for row in cursor.fetchall():
-            correct_answers = json.loads(row[7]) if row[7].startswith('[') else [row[7]]
-            questions.append({
-                "category": row[0],
-                "id": row[1],
-                "question": row[2],
-                "options": [row[3], row[4], row[5], row[6]],
-                "answers": correct_answers,
-                "is_multiple_choice": bool(row[8]),
-                "feedback": row[9] or ""
-            })
-        
-        conn.close()
-        return questions
-    
-    def update_question(self, question_id, question_text, options, correct_answers, is_multiple_choice, feedback=""):
-        correct_answers_json = json.dumps(correct_answers)
-        
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute('''
-        UPDATE questions 
-        SET question_text = ?, option_a = ?, option_b = ?, option_c = ?, option_d = ?, correct_answers = ?, is_multiple_choice = ?, feedback = ?
-        WHERE id = ?
-        ''', (question_text, options[0], options[1], options[2], options[3], correct_answers_json, is_multiple_choice, feedback, question_id))
-        conn.commit()
-        conn.close()
-    
-    def delete_question(self, question_id):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM questions WHERE id = ?", (question_id,))
-        conn.commit()
-        conn.close()
-
-class QuizApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Quiz Application")
-        self.root.geometry("800x600")
-        
-        self.db = QuizDatabase()
-        self.admin_password = "1526"
-        self.current_frame = None
-        self.show_welcome_screen()
-    
-    def clear_current_frame(self):
-        if self.current_frame:
-            self.current_frame.destroy()
-        self.current_frame = tk.Frame(self.root, padx=20, pady=20)
-        self.current_frame.pack(fill=tk.BOTH, expand=True)
-        return self.current_frame
-    
-    def show_welcome_screen(self):
-        frame = self.clear_current_frame()
-        
-        tk.Label(frame, text="Welcome to Quiz App", font=("Arial", 24, "bold")).pack(pady=20)
-        
-        tk.Button(frame, text="Take a Quiz", font=("Arial", 16), 
-                  command=self.show_category_selection, padx=20, pady=10).pack(pady=10)
-        
-        tk.Button(frame, text="Admin Login", font=("Arial", 16), 
-                  command=self.admin_login, padx=20, pady=10).pack(pady=10)
-    
-    def admin_login(self):
-        password = simpledialog.askstring("Admin Login", "Enter admin password:", show='*')
-        if password == self.admin_password:
-            self.show_admin_panel()
-        else:
-            messagebox.showerror("Access Denied", "Incorrect password")
-    
-    def show_category_selection(self):
-        frame = self.clear_current_frame()
-        
-        tk.Label(frame, text="Select Quiz Category", font=("Arial", 20, "bold")).pack(pady=20)
-        
-        categories = self.db.get_categories()
-        
-        if not categories:
-            tk.Label(frame, text="No quiz categories available.", font=("Arial", 14)).pack(pady=20)
-        else:
-            for category in categories:
-                tk.Button(frame, text=category, font=("Arial", 14),
-                          command=lambda c=category: self.start_quiz(c),
-                          padx=20, pady=10, width=20).pack(pady=5)
-        
-        tk.Button(frame, text="Back", command=self.show_welcome_screen).pack(pady=20)
-    
-    def start_quiz(self, category):
-        question_data = self.db.get_questions_by_category(category)
-        
-        if not question_data:
-            messagebox.showinfo("No Questions", f"No questions available for {category}.")
-            self.show_category_selection()
-            return
-        
-        random.shuffle(question_data)
-        
-        self.quiz_questions = [Question(q) for q in question_data]
-        self.current_question = 0
-        self.score = 0
-        
-        self.show_quiz_question()
-    
-    def show_quiz_question(self):
-        frame = self.clear_current_frame()
-        
-        progress_text = f"Question {self.current_question + 1} of {len(self.quiz_questions)} | Score: {self.score}"
-        tk.Label(frame, text=progress_text, font=("Arial", 12)).pack(pady=10)
-        
-        question = self.quiz_questions[self.current_question]
-        question.create_widgets(frame)
-        
-        tk.Button(frame, text="Submit Answer", font=("Arial", 14),
-                  command=self.check_answer, padx=10, pady=5).pack(pady=20)
-    
-    def check_answer(self):
-        question = self.quiz_questions[self.current_question]
-        user_answers = question.get_user_answers()
-        
-        if not user_answers:
-            messagebox.showinfo("Selection Required", 
-                               "Please select at least one answer." if question.is_multiple_choice 
-                               else "Please select an answer.")
-            return
-        
-        is_correct = question.validate_answers(user_answers)
-        
-        if is_correct:
-            self.score += 1
-            messagebox.showinfo("Correct!", "Your answer is correct!")
-        else:
-            formatted_answers = "\n".join(question.correct_answers)
-            feedback_message = f"The correct answer(s):\n{formatted_answers}"
-            
-            if question.feedback:
-                feedback_message += f"\n\nExplanation:\n{question.feedback}"
-                
-            messagebox.showinfo("Incorrect", feedback_message)
-        
-        self.current_question += 1
-        if self.current_question < len(self.quiz_questions):
-            self.show_quiz_question()
-        else:
-            self.show_quiz_results()
-    
-    def show_quiz_results(self):
-        frame = self.clear_current_frame()
-        
-        result_text = f"Quiz Completed!\nYour Score: {self.score}/{len(self.quiz_questions)}"
-        tk.Label(frame, text=result_text, font=("Arial", 20)).pack(pady=30)
-        
-        percentage = (self.score / len(self.quiz_questions)) * 100
-        tk.Label(frame, text=f"{percentage:.1f}%", font=("Arial", 24, "bold")).pack(pady=10)
-        
-        tk.Button(frame, text="Try Another Quiz", font=("Arial", 14),
-                  command=self.show_category_selection, padx=10, pady=5).pack(pady=10)
-        
-        tk.Button(frame, text="Main Menu", font=("Arial", 14),
-                  command=self.show_welcome_screen, padx=10, pady=5).pack(pady=10)
-    
-    def show_admin_panel(self):
-        frame = self.clear_current_frame()
-        
-        tk.Label(frame, text="Admin Panel", font=("Arial", 20, "bold")).pack(pady=20)
-        
-        tk.Button(frame, text="Add New Question", font=("Arial", 14),
-                  command=self.show_add_question_form, padx=10, pady=5, width=20).pack(pady=10)
-        
-        tk.Button(frame, text="View/Edit Questions", font=("Arial", 14),
-                  command=self.show_view_questions, padx=10, pady=5, width=20).pack(pady=10)
-        
-        tk.Button(frame, text="Add Category", font=("Arial", 14),
-                  command=self.show_add_category_form, padx=10, pady=5, width=20).pack(pady=10)
-        
-        tk.Button(frame, text="Logout", font=("Arial", 14),
-                  command=self.show_welcome_screen, padx=10, pady=5).pack(pady=20)
-    
-    def show_add_category_form(self):
-        frame = self.clear_current_frame()
-        
-        tk.Label(frame, text="Add New Category", font=("Arial", 18, "bold")).pack(pady=20)
-        
-        form_frame = tk.Frame(frame)
-        form_frame.pack(pady=10, fill=tk.X)
-        
-        tk.Label(form_frame, text="Category Name:", font=("Arial", 14)).grid(row=0, column=0, sticky=tk.W, pady=10)
-        category_entry = tk.Entry(form_frame, font=("Arial", 14), width=30)
-        category_entry.grid(row=0, column=1, pady=10, padx=5)
-        
-        button_frame = tk.Frame(frame)
-        button_frame.pack(pady=20)
-        
-        def add_category():
-            category_name = category_entry.get().strip()
-            if not category_name:
-                messagebox.showerror("Error", "Category name cannot be empty.")
-                return
-            
-            success = self.db.add_category(category_name)
-            if success:
-                messagebox.showinfo("Success", f"Category '{category_name}' added successfully.")
-                category_entry.delete(0, tk.END)
-            else:
-                messagebox.showerror("Error", f"Category '{category_name}' already exists.")
-        
-        tk.Button(button_frame, text="Add Category", font=("Arial", 14),
-                  command=add_category, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 14),
-                  command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-    
-    def show_add_question_form(self):
-        frame = self.clear_current_frame()
-        
-        tk.Label(frame, text="Add New Question", font=("Arial", 18, "bold")).pack(pady=20)
-        
-        form_frame = tk.Frame(frame)
-        form_frame.pack(pady=10, fill=tk.X)
-        
-        tk.Label(form_frame, text="Category:", font=("Arial", 14)).grid(row=0, column=0, sticky=tk.W, pady=10)
-        
-        categories = self.db.get_categories()
-        category_var = tk.StringVar()
-        
-        if categories:
-            category_var.set(categories[0])
-        
-        category_combo = ttk.Combobox(form_frame, textvariable=category_var, font=("Arial", 14), state="readonly")
-        category_combo['values'] = categories
-        category_combo.grid(row=0, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
-        
-        tk.Label(form_frame, text="Question:", font=("Arial", 14)).grid(row=1, column=0, sticky=tk.W, pady=10)
-        question_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
-        question_entry.grid(row=1, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
-        
-        multiple_choice_var = tk.BooleanVar()
-        tk.Checkbutton(form_frame, text="Multiple Correct Answers", font=("Arial", 14),
-                      variable=multiple_choice_var).grid(row=2, column=1, sticky=tk.W, pady=5)
-        
-        option_entries = []
-        option_vars = []
-        
-        for i in range(4):
-            tk.Label(form_frame, text=f"Option {chr(65+i)}:", font=("Arial", 14)).grid(row=3+i, column=0, sticky=tk.W, pady=5)
-            option_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
-            option_entry.grid(row=3+i, column=1, pady=5, padx=5, sticky=tk.W+tk.E)
-            option_entries.append(option_entry)
-            
-            var = tk.BooleanVar()
-            option_vars.append(var)
-            tk.Checkbutton(form_frame, text="Correct", variable=var).grid(row=3+i, column=2, padx=5)
-        
-        tk.Label(form_frame, text="Feedback:", font=("Arial", 14)).grid(row=7, column=0, sticky=tk.W, pady=10)
-        feedback_text = tk.Text(form_frame, font=("Arial", 12), width=40, height=5)
-        feedback_text.grid(row=7, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
-        tk.Label(form_frame, text="(Shown when answer is incorrect)", font=("Arial", 10, "italic")).grid(row=8, column=1, sticky=tk.W, pady=0)
-        
-        button_frame = tk.Frame(frame)
-        button_frame.pack(pady=20)
-        
-        def add_question():
-            category = category_var.get()
-            question_text = question_entry.get().strip()
-            options = [entry.get().strip() for entry in option_entries]
-            is_multiple_choice = multiple_choice_var.get()
-            feedback = feedback_text.get("1.0", tk.END).strip()
-            
-            if not category or not question_text or "" in options:
-                messagebox.showerror("Error", "All fields must be filled.")
-                return
-            
-            correct_answers = []
-            for i, var in enumerate(option_vars):
-                if var.get():
-                    correct_answers.append(options[i])
-            
-            if not correct_answers:
-                messagebox.showerror("Error", "Please select at least one correct answer.")
-                return
-            
-            if not is_multiple_choice and len(correct_answers) > 1:
-                messagebox.showerror("Error", "Single choice questions can only have one correct answer.")
-                return
-            
-            self.db.add_question(category, question_text, options, correct_answers, is_multiple_choice, feedback)
-            messagebox.showinfo("Success", "Question added successfully!")
-            
-            question_entry.delete(0, tk.END)
-            multiple_choice_var.set(False)
-            for entry in option_entries:
-                entry.delete(0, tk.END)
-            for var in option_vars:
-                var.set(False)
-            feedback_text.delete("1.0", tk.END)
-        
-        tk.Button(button_frame, text="Add Question", font=("Arial", 14),
-                 command=add_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 14),
-                 command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-    
-    def show_view_questions(self):
-        frame = self.clear_current_frame()
-        
-        tk.Label(frame, text="View/Edit Questions", font=("Arial", 18, "bold")).pack(pady=10)
-        
-        tree_frame = tk.Frame(frame)
-        tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
-        
-        scrollbar = ttk.Scrollbar(tree_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        columns = ("ID", "Category", "Question", "Type", "Correct Answers", "Has Feedback")
-        tree = ttk.Treeview(tree_frame, columns=columns, show="headings", yscrollcommand=scrollbar.set)
-        
-        for col in columns:
-            tree.heading(col, text=col)
-        
-        tree.column("ID", width=50)
-        tree.column("Category", width=100)
-        tree.column("Question", width=300)
-        tree.column("Type", width=100)
-        tree.column("Correct Answers", width=150)
-        tree.column("Has Feedback", width=100)
-        
-        tree.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=tree.yview)
-        
-        questions = self.db.get_all_questions()
-        
-        for q in questions:
-            question_type = "Multiple Choice" if q["is_multiple_choice"] else "Single Choice"
-            answers_text = ", ".join(q["answers"])
-            has_feedback = "Yes" if q["feedback"] else "No"
-            tree.insert("", tk.END, values=(q["id"], q["category"], q["question"], question_type, answers_text, has_feedback))
-        
-        button_frame = tk.Frame(frame)
-        button_frame.pack(pady=10, fill=tk.X)
-        
-        def edit_question():
-            selected_item = tree.selection()
-            if not selected_item:
-                messagebox.showinfo("Selection Required", "Please select a question to edit.")
-                return
-            
-            item_id = tree.item(selected_item, "values")[0]
-            self.show_edit_question_form(item_id)
-        
-        tk.Button(button_frame, text="Edit Selected", font=("Arial", 12),
-                  command=edit_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-        
-        def delete_question():
-            selected_item = tree.selection()
-            if not selected_item:
-                messagebox.showinfo("Selection Required", "Please select a question to delete.")
-                return
-            
-            item_id = tree.item(selected_item, "values")[0]
-            if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this question?"):
-                self.db.delete_question(item_id)
-                tree.delete(selected_item)
-                messagebox.showinfo("Success", "Question deleted successfully!")
-        
-        tk.Button(button_frame, text="Delete Selected", font=("Arial", 12),
-                  command=delete_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 12),
-                  command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.RIGHT, padx=5)
-    
-    def show_edit_question_form(self, question_id):
-        questions = self.db.get_all_questions()
-        question_data = next((q for q in questions if str(q["id"]) == str(question_id)), None)
-        
-        if not question_data:
-            messagebox.showerror("Error", "Question not found.")
-            return
-        
-        frame = self.clear_current_frame()
-        
-        tk.Label(frame, text="Edit Question", font=("Arial", 18, "bold")).pack(pady=20)
-        
-        form_frame = tk.Frame(frame)
-        form_frame.pack(pady=10, fill=tk.X)
-        
-        tk.Label(form_frame, text="Category:", font=("Arial", 14)).grid(row=0, column=0, sticky=tk.W, pady=10)
-        tk.Label(form_frame, text=question_data["category"], font=("Arial", 14)).grid(row=0, column=1, pady=10, padx=5, sticky=tk.W)
-        
-        tk.Label(form_frame, text="Question:", font=("Arial", 14)).grid(row=1, column=0, sticky=tk.W, pady=10)
-        question_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
-        question_entry.insert(0, question_data["question"])
-        question_entry.grid(row=1, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
-        
-        multiple_choice_var = tk.BooleanVar(value=question_data["is_multiple_choice"])
-        tk.Checkbutton(form_frame, text="Multiple Correct Answers", font=("Arial", 14),
-                      variable=multiple_choice_var).grid(row=2, column=1, sticky=tk.W, pady=5)
-        
-        option_entries = []
-        option_vars = []
-        
-        for i in range(4):
-            tk.Label(form_frame, text=f"Option {chr(65+i)}:", font=("Arial", 14)).grid(row=3+i, column=0, sticky=tk.W, pady=5)
-            option_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
-            
-            if i < len(question_data["options"]):
-                option_entry.insert(0, question_data["options"][i])
-                
-            option_entry.grid(row=3+i, column=1, pady=5, padx=5, sticky=tk.W+tk.E)
-            option_entries.append(option_entry)
-            
-            var = tk.BooleanVar()
-            if question_data["options"][i] in question_data["answers"]:
-                var.set(True)
-            option_vars.append(var)
-            tk.Checkbutton(form_frame, text="Correct", variable=var).grid(row=3+i, column=2, padx=5)
-        
-        tk.Label(form_frame, text="Feedback:", font=("Arial", 14)).grid(row=7, column=0, sticky=tk.W, pady=10)
-        feedback_text = tk.Text(form_frame, font=("Arial", 12), width=40, height=5)
-        feedback_text.insert("1.0", question_data["feedback"])
-        feedback_text.grid(row=7, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
-        tk.Label(form_frame, text="(Shown when answer is incorrect)", font=("Arial", 10, "italic")).grid(row=8, column=1, sticky=tk.W, pady=0)
-        
-        button_frame = tk.Frame(frame)
-        button_frame.pack(pady=20)
-        
-        def save_question():
-            question_text = question_entry.get().strip()
-            options = [entry.get().strip() for entry in option_entries]
-            is_multiple_choice = multiple_choice_var.get()
-            feedback = feedback_text.get("1.0", tk.END).strip()
-            
-            if not question_text or "" in options:
-                messagebox.showerror("Error", "All fields must be filled.")
-                return
-            
-            correct_answers = []
-            for i, var in enumerate(option_vars):
-                if var.get():
-                    correct_answers.append(options[i])
-            
-            if not correct_answers:
-                messagebox.showerror("Error", "Please select at least one correct answer.")
-                return
-            
-            if not is_multiple_choice and len(correct_answers) > 1:
-                messagebox.showerror("Error", "Single choice questions can only have one correct answer.")
-                return
-            
-            self.db.update_question(question_id, question_text, options, correct_answers, is_multiple_choice, feedback)
-            messagebox.showinfo("Success", "Question updated successfully!")
-            self.show_view_questions()
-        
-        tk.Button(button_frame, text="Save Changes", font=("Arial", 14),
-                  command=save_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(button_frame, text="Cancel", font=("Arial", 14),
-                  command=self.show_view_questions, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = QuizApp(root)
-    root.mainloop()
+import sqlite3
+import random
+import json
+import csv
+import os
+import threading
+import time
+import concurrent.futures
+import sys
+import io
+import bisect
+import atexit
+import argparse
+import functools
+import operator
+import collections
+import struct
+import zlib
+import re
+import hashlib
+import itertools
+
+tk = ttk = messagebox = simpledialog = filedialog = None
+
+def load_tk():
+    global tk, ttk, messagebox, simpledialog, filedialog
+    if tk is None:
+        import tkinter
+        import tkinter.ttk
+        import tkinter.messagebox
+        import tkinter.simpledialog
+        import tkinter.filedialog
+        ttk = tkinter.ttk
+        messagebox = tkinter.messagebox
+        simpledialog = tkinter.simpledialog
+        filedialog = tkinter.filedialog
+        tk = tkinter
+    return tk
+
+np = None
+
+def load_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = False
+    return np
+
+Image = None
+
+def load_pil():
+    global Image
+    if Image is None:
+        try:
+            from PIL import Image as pil_image
+            Image = pil_image
+        except ImportError:
+            Image = False
+    return Image
+
+MIN_OPTIONS = 2
+MAX_OPTIONS = 32
+
+def encode_answers(options, answers):
+    mask = 0
+    for position, option in enumerate(options):
+        if option in answers:
+            mask |= 1 << position
+    return mask
+
+def decode_answers(options, mask):
+    return [option for position, option in enumerate(options) if mask >> position & 1]
+
+class Question:
+    __slots__ = ("id", "question_text", "options", "correct_mask", "is_multiple_choice", "feedback", "attachments", "option_vars")
+    
+    def __init__(self, question_data):
+        self.id = question_data.get("id")
+        self.question_text = question_data["question"]
+        self.options = question_data["options"]
+        self.correct_mask = question_data.get("correct_mask")
+        if self.correct_mask is None:
+            self.correct_mask = encode_answers(self.options, question_data["answers"])
+        self.is_multiple_choice = question_data["is_multiple_choice"]
+        self.feedback = question_data["feedback"]
+        self.attachments = question_data.get("attachments", [])
+        self.option_vars = None
+    
+    @property
+    def correct_answers(self):
+        return decode_answers(self.options, self.correct_mask)
+    
+    def bind_widgets(self, quiz_view):
+        quiz_view.question_label.config(text=self.question_text)
+        
+        choice_type = "Multiple answers allowed" if self.is_multiple_choice else "Select one answer"
+        quiz_view.choice_label.config(text=choice_type)
+        
+        if self.is_multiple_choice:
+            self.option_vars = []
+            for button, var, option in quiz_view.show_check_buttons(self.options):
+                self.option_vars.append((var, option))
+        else:
+            self.option_vars = quiz_view.show_radio_buttons(self.options)
+        
+        return quiz_view.options_frame
+    
+    def get_user_answers(self):
+        user_answers = []
+        
+        if self.is_multiple_choice:
+            for var, option in self.option_vars:
+                if var.get():
+                    user_answers.append(option)
+        else:
+            if self.option_vars.get():
+                user_answers = [self.option_vars.get()]
+                
+        return user_answers
+    
+    def answer_mask(self, user_answers):
+        mask = 0
+        for answer in user_answers if self.is_multiple_choice else user_answers[:1]:
+            mask |= 1 << (self.options.index(answer) if answer in self.options else len(self.options))
+        return mask
+    
+    def validate_mask(self, mask):
+        if not mask:
+            return None
+        
+        if self.is_multiple_choice:
+            return mask == self.correct_mask
+        return mask & self.correct_mask == mask
+    
+    def validate_answers(self, user_answers):
+        return self.validate_mask(self.answer_mask(user_answers))
+
+class QuizSession:
+    def __init__(self, questions, recorder=None, attempt_id=None, scheduler=None):
+        self.questions = questions
+        self.recorder = recorder
+        self.attempt_id = attempt_id
+        self.scheduler = scheduler
+        self.current = 0
+        self.score = 0
+        self.results = []
+        self._shown_index = None
+        self._shown_at = None
+    
+    @property
+    def total(self):
+        return len(self.questions)
+    
+    @property
+    def finished(self):
+        return self.current >= len(self.questions)
+    
+    @property
+    def percentage(self):
+        return (self.score / len(self.questions)) * 100 if self.questions else 0.0
+    
+    def next_question(self):
+        if self.finished:
+            return None
+        question = self.questions[self.current]
+        if self._shown_index != self.current:
+            self._shown_index = self.current
+            self._shown_at = time.perf_counter()
+        return question
+    
+    def submit(self, answers):
+        question = self.next_question()
+        if question is None:
+            raise IndexError("The quiz is already finished")
+        
+        is_correct = question.validate_answers(answers)
+        if is_correct is None:
+            return None
+        
+        response_ms = int((time.perf_counter() - self._shown_at) * 1000)
+        if is_correct:
+            self.score += 1
+        self.results.append({
+            "question": question.question_text,
+            "answers": list(answers),
+            "correct_answers": list(question.correct_answers),
+            "correct": is_correct,
+            "response_ms": response_ms
+        })
+        
+        if self.recorder and self.attempt_id is not None:
+            self.recorder.add_response(self.attempt_id, question.id, answers, is_correct, response_ms)
+            if self.current + 1 >= len(self.questions):
+                self.recorder.finish_attempt(self.attempt_id, self.score, len(self.questions))
+        if self.scheduler:
+            self.scheduler.record_answer(question.id, is_correct, response_ms)
+        self.current += 1
+        return is_correct
+
+class QuizView:
+    def __init__(self, parent_frame, on_submit):
+        load_tk()
+        self.frame = parent_frame
+        
+        self.progress_label = tk.Label(parent_frame, font=("Arial", 12))
+        self.progress_label.pack(pady=10)
+        
+        self.question_label = tk.Label(parent_frame, font=("Arial", 16), wraplength=700)
+        self.question_label.pack(pady=20)
+        
+        self.media_frame = tk.Frame(parent_frame)
+        self.media_frame.pack()
+        self.media_labels = []
+        self.media_keys = []
+        self.media_images = []
+        
+        self.choice_label = tk.Label(parent_frame, font=("Arial", 12, "italic"))
+        self.choice_label.pack(pady=5)
+        
+        self.options_frame = tk.Frame(parent_frame)
+        self.options_frame.pack(pady=10, fill=tk.X)
+        
+        self.answer_var = tk.StringVar()
+        self.radio_buttons = []
+        self.check_buttons = []
+        self.shown_buttons = []
+        
+        tk.Button(parent_frame, text="Submit Answer", font=("Arial", 14),
+                  command=on_submit, padx=10, pady=5).pack(pady=20)
+    
+    def exists(self):
+        return self.frame.winfo_exists()
+    
+    def _show_buttons(self, buttons):
+        if buttons != self.shown_buttons:
+            for button in self.shown_buttons:
+                button.pack_forget()
+            for button in buttons:
+                button.pack(anchor=tk.W)
+            self.shown_buttons = buttons
+    
+    def show_radio_buttons(self, options):
+        while len(self.radio_buttons) < len(options):
+            self.radio_buttons.append(tk.Radiobutton(self.options_frame, font=("Arial", 14), variable=self.answer_var,
+                                                     padx=10, pady=5))
+        
+        self.answer_var.set("")
+        buttons = self.radio_buttons[:len(options)]
+        for button, option in zip(buttons, options):
+            button.config(text=option, value=option)
+        self._show_buttons(buttons)
+        return self.answer_var
+    
+    def show_check_buttons(self, options):
+        while len(self.check_buttons) < len(options):
+            var = tk.BooleanVar()
+            self.check_buttons.append((tk.Checkbutton(self.options_frame, font=("Arial", 14), variable=var,
+                                                      padx=10, pady=5), var))
+        
+        bound = []
+        for (button, var), option in zip(self.check_buttons, options):
+            var.set(False)
+            button.config(text=option)
+            bound.append((button, var, option))
+        self._show_buttons([button for button, var, option in bound])
+        return bound
+    
+    def show(self, question, progress_text):
+        self.progress_label.config(text=progress_text)
+        question.bind_widgets(self)
+    
+    def show_media(self, keys, images):
+        while len(self.media_labels) < len(images):
+            self.media_labels.append(tk.Label(self.media_frame, font=("Arial", 12, "italic")))
+        
+        for label, image in zip(self.media_labels, images):
+            if isinstance(image, str):
+                label.config(image="", text=image)
+            else:
+                label.config(image=image, text="")
+            label.pack(side=tk.LEFT, padx=5)
+        for label in self.media_labels[len(images):]:
+            label.pack_forget()
+        self.media_keys = keys
+        self.media_images = images
+
+FAST_ANSWER_MS = 10000
+RELEARN_SECONDS = 600
+SM2_INITIAL_STATE = (0, 2.5, 0.0)
+RESPONSE_FLUSH_SECONDS = 2.0
+RESPONSE_BATCH_SIZE = 500
+
+class QuestionSequence:
+    def __init__(self, db, question_ids):
+        self.db = db
+        self.question_ids = question_ids
+        self._loaded = {}
+    
+    def __len__(self):
+        return len(self.question_ids)
+    
+    def __getitem__(self, index):
+        if index not in self._loaded:
+            self.load(index)
+        return self._loaded[index]
+    
+    def is_loaded(self, index):
+        return index in self._loaded
+    
+    def load(self, index):
+        question = self._loaded.get(index)
+        if question is None:
+            question_data = self.db.get_question_by_id(self.question_ids[index])
+            if question_data is None:
+                raise IndexError(f"Question {self.question_ids[index]} no longer exists")
+            question = self._loaded.setdefault(index, Question(question_data))
+        return question
+
+def schedule_review(state, is_correct, response_ms, now):
+    repetitions, ease, interval_days = state
+    quality = (5 if response_ms < FAST_ANSWER_MS else 4) if is_correct else 1
+    
+    if quality >= 3:
+        repetitions += 1
+        if repetitions == 1:
+            interval_days = 1.0
+        elif repetitions == 2:
+            interval_days = 6.0
+        else:
+            interval_days = round(interval_days * ease, 2)
+        due_at = now + interval_days * 86400
+    else:
+        repetitions = 0
+        interval_days = 0.0
+        due_at = now + RELEARN_SECONDS
+    
+    ease = max(1.3, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, ease, interval_days, due_at
+
+class ScheduledQuestions(QuestionSequence):
+    def __init__(self, db, category_name, length=None, student="", clock=time.time):
+        super().__init__(db, [])
+        self.category_id = db.get_category_id(category_name)
+        question_count = dict(db.get_category_counts()).get(category_name, 0)
+        self.length = question_count if length is None else min(length, question_count)
+        self.student = student
+        self.clock = clock
+        self.last_new_id, self.seen_id = db.get_review_progress(student, self.category_id) if self.category_id else (0, 0)
+        self._pending = []
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return self.length
+    
+    def record_answer(self, question_id, is_correct, response_ms):
+        with self._lock:
+            self._pending.append((question_id, is_correct, response_ms, self.clock()))
+    
+    def flush(self):
+        with self._lock:
+            updates, self._pending = self._pending, []
+            self.db.apply_reviews(self.student, self.category_id, updates, self.last_new_id, self.seen_id)
+    
+    def load(self, index):
+        if index >= self.length:
+            raise IndexError("The quiz has no more questions")
+        
+        with self._lock:
+            if self._pending:
+                updates, self._pending = self._pending, []
+                self.db.apply_reviews(self.student, self.category_id, updates, self.last_new_id, self.seen_id)
+            
+            while len(self.question_ids) <= index:
+                question_id, is_new, self.seen_id = self.db.pick_review_question(self.student, self.category_id, self.question_ids,
+                                                                                 self.last_new_id, self.clock(), self.seen_id)
+                if question_id is None:
+                    raise IndexError("The quiz has no more questions")
+                if is_new:
+                    self.last_new_id = question_id
+                self.question_ids.append(question_id)
+        
+        return super().load(index)
+
+class ResponseBuffer:
+    def __init__(self, db, flush_interval=RESPONSE_FLUSH_SECONDS, max_pending=RESPONSE_BATCH_SIZE):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.flushed = 0
+        self._responses = []
+        self._finished_attempts = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="quiz-responses", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def add_response(self, attempt_id, question_id, chosen_answers, is_correct, response_ms):
+        with self._lock:
+            self._responses.append((attempt_id, question_id, json.dumps(list(chosen_answers)), bool(is_correct),
+                                    int(response_ms), time.time()))
+            pending = len(self._responses)
+        if pending >= self.max_pending:
+            self._wakeup.set()
+    
+    def finish_attempt(self, attempt_id, score, total):
+        with self._lock:
+            self._finished_attempts.append((score, total, time.time(), attempt_id))
+        self._wakeup.set()
+    
+    def pending(self):
+        with self._lock:
+            return len(self._responses) + len(self._finished_attempts)
+    
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                responses, self._responses = self._responses, []
+                finished_attempts, self._finished_attempts = self._finished_attempts, []
+            if not responses and not finished_attempts:
+                return 0
+            
+            try:
+                self.db.record_responses(responses, finished_attempts)
+            except Exception:
+                with self._lock:
+                    self._responses[:0] = responses
+                    self._finished_attempts[:0] = finished_attempts
+                raise
+            self.flushed += len(responses)
+            return len(responses)
+    
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except (sqlite3.Error, OSError):
+                pass
+    
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._wakeup.set()
+            self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class DatabaseWorker:
+    def __init__(self, db):
+        self.db = db
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-db")
+    
+    def submit(self, function, *args, **kwargs):
+        return self.executor.submit(function, *args, **kwargs)
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+MEDIA_MAX_WIDTH = 640
+MEDIA_MAX_HEIGHT = 200
+MEDIA_CACHE_BYTES = 64 * 1024 * 1024
+MEDIA_WORKERS = 2
+MEDIA_SIGNATURES = ((b"\x89PNG\r\n\x1a\n", "image/png"), (b"GIF87a", "image/gif"), (b"GIF89a", "image/gif"),
+                    (b"\xff\xd8\xff", "image/jpeg"), (b"BM", "image/bmp"))
+TK_MEDIA_TYPES = ("image/png", "image/gif")
+
+def attachment_media_type(data):
+    for signature, media_type in MEDIA_SIGNATURES:
+        if data.startswith(signature):
+            return media_type
+    raise ValueError("Attachments must be PNG, GIF, JPEG or BMP images.")
+
+def tk_image_size(media_type, data):
+    if media_type == "image/png" and data[12:16] == b"IHDR":
+        return struct.unpack(">II", data[16:24])
+    if media_type == "image/gif" and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    raise ValueError(f"Damaged {media_type} image")
+
+def decode_attachment(db, attachment_id, max_width=MEDIA_MAX_WIDTH, max_height=MEDIA_MAX_HEIGHT):
+    attachment = db.get_attachment(attachment_id)
+    if attachment is None:
+        raise ValueError(f"Image {attachment_id} no longer exists")
+    media_type, data = attachment
+    
+    if not load_pil():
+        if media_type not in TK_MEDIA_TYPES:
+            raise ValueError(f"Install Pillow to show {media_type} images")
+        width, height = tk_image_size(media_type, data)
+        if width > max_width or height > max_height:
+            raise ValueError(f"Install Pillow to show images larger than {max_width}x{max_height}")
+        return data, (width, height)
+    
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("RGB", (max_width, max_height))
+        image.thumbnail((max_width, max_height))
+        if image.mode in ("RGBA", "LA", "P", "PA"):
+            image = image.convert("RGBA")
+            flattened = Image.new("RGB", image.size, "white")
+            flattened.paste(image, mask=image.getchannel("A"))
+            image = flattened
+        else:
+            image = image.convert("RGB")
+    return b"P6 %d %d 255\n" % image.size + image.tobytes(), image.size
+
+def photo_image(decoded):
+    data, (width, height) = decoded
+    return tk.PhotoImage(data=data), width * height * 4
+
+class MediaCache:
+    def __init__(self, max_bytes=MEDIA_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.images = collections.OrderedDict()
+    
+    def __contains__(self, key):
+        return key in self.images
+    
+    def __len__(self):
+        return len(self.images)
+    
+    def get(self, key):
+        entry = self.images.get(key)
+        if entry is None:
+            return None
+        self.images.move_to_end(key)
+        return entry[0]
+    
+    def put(self, key, image, size):
+        if key in self.images:
+            self.size -= self.images.pop(key)[1]
+        self.images[key] = (image, size)
+        self.size += size
+        while self.size > self.max_bytes and len(self.images) > 1:
+            self.size -= self.images.popitem(last=False)[1][1]
+    
+    def clear(self):
+        self.images.clear()
+        self.size = 0
+
+INSERT_QUESTION_SQL = '''
+INSERT INTO questions (category_id, question_text, option_a, option_b, option_c, option_d, options_text, correct_answers, correct_mask,
+                       is_multiple_choice, feedback)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_OPTION_SQL = "INSERT INTO question_options (question_id, position, option_text) VALUES (?, ?, ?)"
+
+def legacy_options(options):
+    return (list(options) + [""] * 4)[:4]
+
+def join_options(options):
+    return "\n".join(options)
+
+def backfill_question_options(cursor):
+    rows = cursor.execute("SELECT id, option_a, option_b, option_c, option_d, correct_answers FROM questions").fetchall()
+    option_rows = []
+    masks = []
+    for question_id, *options, correct_answers in rows:
+        options = [option for option in options if option]
+        answers = json.loads(correct_answers) if correct_answers.startswith('[') else [correct_answers]
+        option_rows.extend((question_id, position, option) for position, option in enumerate(options))
+        masks.append((encode_answers(options, answers), question_id))
+    cursor.executemany(INSERT_OPTION_SQL, option_rows)
+    cursor.executemany("UPDATE questions SET correct_mask = ? WHERE id = ?", masks)
+
+FTS_INSERT_TRIGGER_SQL = '''CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts (rowid, question_text, options_text, feedback)
+    VALUES (new.id, new.question_text, new.options_text, new.feedback);
+END'''
+
+FTS_BULK_INSERT_SQL = '''
+INSERT INTO questions_fts (rowid, question_text, options_text, feedback)
+SELECT id, question_text, options_text, feedback FROM questions WHERE id > ?
+'''
+
+QUESTION_STATS_TRIGGER_SQL = '''CREATE TRIGGER IF NOT EXISTS question_stats_insert AFTER INSERT ON questions BEGIN
+    INSERT OR IGNORE INTO question_stats (question_id) VALUES (new.id);
+END'''
+
+IMPORT_BATCH_SIZE = 1000
+
+MINHASH_SIZE = 64
+LSH_BANDS = 16
+LSH_MIN_SHARED_BANDS = 2
+DUPLICATE_SIMILARITY = 0.8
+
+MINHASH_MULTIPLIER = 0x9E3779B97F4A7C15
+MINHASH_MASK = (1 << 64) - 1
+MINHASH_VALUE_BITS = 64 - (MINHASH_SIZE - 1).bit_length()
+MINHASH_SHIFT = MINHASH_VALUE_BITS - 16
+MINHASH_OFFSETS = [distance * MINHASH_MULTIPLIER & MINHASH_MASK for distance in range(MINHASH_SIZE)]
+MINHASH_TOKEN_PATTERN = re.compile(r"\w+|\x00")
+MINHASH_ASCII_TOKENS = bytes(c if c == 0 or chr(c).isalnum() or chr(c) == "_" else 32 for c in range(256))
+MINHASH_SEPARATOR = 1 << 32
+MINHASH_SIGNATURE = struct.Struct(f">{MINHASH_SIZE}H")
+LSH_BAND_BYTES = MINHASH_SIGNATURE.size // LSH_BANDS
+
+INSERT_MINHASH_SQL = "INSERT OR REPLACE INTO question_minhash (question_id, signature) VALUES (?, ?)"
+INSERT_LSH_SQL = "INSERT OR IGNORE INTO question_lsh (bucket, question_id) VALUES (?, ?)"
+
+LSH_BULK_INSERT_SQL = f'''
+INSERT OR IGNORE INTO question_lsh (bucket, question_id)
+SELECT substr(m.signature, b.column1, {LSH_BAND_BYTES}), m.question_id
+FROM question_minhash m, (VALUES {', '.join(f"({1 + band * LSH_BAND_BYTES})" for band in range(LSH_BANDS))}) b
+WHERE m.question_id > ?
+ORDER BY 1, 2
+'''
+
+def _minhash_python(hashes):
+    shingles = set(hashes)
+    shingles.update([first << 32 | second for first, second in zip(hashes, hashes[1:])])
+    values = sorted([shingle * MINHASH_MULTIPLIER & MINHASH_MASK for shingle in shingles], reverse=True)
+    bins = dict(zip([value >> MINHASH_VALUE_BITS for value in values], values))
+    if not bins:
+        return MINHASH_SIGNATURE.pack(*[0] * MINHASH_SIZE)
+    
+    indexes = sorted(bins)
+    signature = []
+    previous = indexes[-1] - MINHASH_SIZE
+    for index in indexes:
+        value = bins[index]
+        signature += [(value + offset) >> MINHASH_SHIFT & 0xFFFF for offset in MINHASH_OFFSETS[index - previous - 1::-1]]
+        previous = index
+    start = MINHASH_SIZE - 1 - indexes[-1]
+    return MINHASH_SIGNATURE.pack(*signature[start:], *signature[:start])
+
+def _minhash_numpy(hashes, count):
+    hashes = np.array(hashes, dtype=np.uint64)
+    separators = hashes == MINHASH_SEPARATOR
+    rows = np.cumsum(separators)[~separators]
+    hashes = hashes[~separators]
+    pairs = rows[:-1] == rows[1:]
+    shingles = np.concatenate([hashes, hashes[:-1][pairs] << np.uint64(32) | hashes[1:][pairs]])
+    rows = np.concatenate([rows, rows[:-1][pairs]])
+    
+    values = shingles * np.uint64(MINHASH_MULTIPLIER)
+    bins = np.full(count * MINHASH_SIZE, MINHASH_MASK, dtype=np.uint64)
+    np.minimum.at(bins, rows * MINHASH_SIZE + (values >> np.uint64(MINHASH_VALUE_BITS)).astype(np.int64), values)
+    bins = bins.reshape(count, MINHASH_SIZE)
+    
+    positions = np.arange(2 * MINHASH_SIZE)
+    filled = np.tile(bins != MINHASH_MASK, 2)
+    following = np.minimum.accumulate(np.where(filled, positions, 2 * MINHASH_SIZE)[:, ::-1], axis=1)[:, ::-1][:, :MINHASH_SIZE]
+    empty_rows = following[:, 0] == 2 * MINHASH_SIZE
+    following[empty_rows] = positions[:MINHASH_SIZE]
+    values = np.take_along_axis(bins, following % MINHASH_SIZE, axis=1)
+    offsets = np.array(MINHASH_OFFSETS, dtype=np.uint64)[following - positions[:MINHASH_SIZE]]
+    signatures = ((values + offsets) >> np.uint64(MINHASH_SHIFT) & np.uint64(0xFFFF)).astype(">u2")
+    signatures[empty_rows] = 0
+    return [signature.tobytes() for signature in signatures]
+
+def minhash_signatures(questions, use_numpy=True):
+    texts = [" ".join([question_text, *options]).replace("\x00", " ") for question_text, options in questions]
+    if not texts:
+        return []
+    text = " \x00 ".join(texts).lower()
+    if text.isascii():
+        tokens = text.encode("ascii").translate(MINHASH_ASCII_TOKENS).split()
+    else:
+        tokens = [token.encode("utf-8") for token in MINHASH_TOKEN_PATTERN.findall(text)]
+    token_hashes = {token: zlib.crc32(token) for token in set(tokens)}
+    token_hashes[b"\x00"] = MINHASH_SEPARATOR
+    hashes = list(map(token_hashes.__getitem__, tokens))
+    if use_numpy and load_numpy():
+        return _minhash_numpy(hashes, len(texts))
+    
+    signatures = []
+    start = 0
+    for _ in range(len(texts) - 1):
+        end = tokens.index(b"\x00", start)
+        signatures.append(_minhash_python(hashes[start:end]))
+        start = end + 1
+    signatures.append(_minhash_python(hashes[start:]))
+    return signatures
+
+def minhash_signature(question_text, options):
+    return minhash_signatures([(question_text, options)], use_numpy=False)[0]
+
+def signature_similarity(first, second):
+    return sum(a == b for a, b in zip(MINHASH_SIGNATURE.unpack(first), MINHASH_SIGNATURE.unpack(second))) / MINHASH_SIZE
+
+def lsh_buckets(signature):
+    return [signature[start:start + LSH_BAND_BYTES] for start in range(0, len(signature), LSH_BAND_BYTES)]
+
+def lsh_rows(question_id, signature):
+    return [(bucket, question_id) for bucket in lsh_buckets(signature)]
+
+def backfill_question_lsh(cursor, after_id=0):
+    rows = cursor.execute("SELECT id, question_text, options_text FROM questions WHERE id > ?", (after_id,)).fetchall()
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start:start + IMPORT_BATCH_SIZE]
+        signatures = minhash_signatures([(question_text, [options_text]) for _, question_text, options_text in batch])
+        cursor.executemany(INSERT_MINHASH_SQL, [(question_id, signature) for (question_id, _, _), signature in zip(batch, signatures)])
+    cursor.execute(LSH_BULK_INSERT_SQL, (after_id,))
+
+CHANGE_LOG_TABLES = ("categories", "questions")
+CHANGE_LOG_LIMIT = 10000
+
+def change_trigger_sql(table, event):
+    row = "new" if event == "insert" else "old"
+    return f'''CREATE TRIGGER IF NOT EXISTS {table}_change_{event} AFTER {event.upper()} ON {table} BEGIN
+    INSERT INTO change_log (table_name, row_id) VALUES ('{table}', {row}.id);
+END'''
+
+SCHEMA_MIGRATIONS = [
+    (1, [
+        "CREATE INDEX IF NOT EXISTS idx_questions_category_id ON questions (category_id, id)",
+        "CREATE INDEX IF NOT EXISTS idx_questions_question_text ON questions (question_text, id)",
+        "CREATE INDEX IF NOT EXISTS idx_questions_is_multiple_choice ON questions (is_multiple_choice, id)",
+    ]),
+    (2, [
+        "ALTER TABLE questions ADD COLUMN options_text TEXT NOT NULL DEFAULT ''",
+        f'''UPDATE questions SET options_text = substr({" || ".join(f"IIF(option_{letter} != '', char(10) || option_{letter}, '')" for letter in "abcd")}, 2)''',
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+            question_text, options_text, feedback,
+            content='questions', content_rowid='id'
+        )''',
+        FTS_INSERT_TRIGGER_SQL,
+        '''CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+            INSERT INTO questions_fts (questions_fts, rowid, question_text, options_text, feedback)
+            VALUES ('delete', old.id, old.question_text, old.options_text, old.feedback);
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE ON questions BEGIN
+            INSERT INTO questions_fts (questions_fts, rowid, question_text, options_text, feedback)
+            VALUES ('delete', old.id, old.question_text, old.options_text, old.feedback);
+            INSERT INTO questions_fts (rowid, question_text, options_text, feedback)
+            VALUES (new.id, new.question_text, new.options_text, new.feedback);
+        END''',
+        "INSERT INTO questions_fts (questions_fts) VALUES ('rebuild')",
+    ]),
+    (3, [
+        '''CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_id INTEGER,
+            student TEXT NOT NULL DEFAULT '',
+            started_at REAL NOT NULL,
+            finished_at REAL,
+            score INTEGER,
+            total INTEGER,
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS responses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            attempt_id INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            chosen_answers TEXT NOT NULL,
+            is_correct BOOLEAN NOT NULL,
+            response_ms INTEGER NOT NULL,
+            answered_at REAL NOT NULL,
+            FOREIGN KEY (attempt_id) REFERENCES attempts (id)
+        )''',
+        "CREATE INDEX IF NOT EXISTS idx_responses_attempt_id ON responses (attempt_id)",
+        "CREATE INDEX IF NOT EXISTS idx_responses_question_id ON responses (question_id)",
+    ]),
+    (4, [
+        '''CREATE TABLE IF NOT EXISTS question_stats (
+            question_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            total_ms INTEGER NOT NULL DEFAULT 0,
+            percent_correct REAL NOT NULL DEFAULT -1,
+            avg_ms REAL NOT NULL DEFAULT -1
+        )''',
+        '''CREATE TABLE IF NOT EXISTS category_stats (
+            category_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            total_ms INTEGER NOT NULL DEFAULT 0
+        )''',
+        '''INSERT OR REPLACE INTO question_stats (question_id, attempts, correct, total_ms, percent_correct, avg_ms)
+        SELECT question_id, COUNT(*), SUM(is_correct), SUM(response_ms), 100.0 * SUM(is_correct) / COUNT(*), 1.0 * SUM(response_ms) / COUNT(*)
+        FROM responses GROUP BY question_id''',
+        '''INSERT OR REPLACE INTO category_stats (category_id, attempts, correct, total_ms)
+        SELECT q.category_id, COUNT(*), SUM(r.is_correct), SUM(r.response_ms)
+        FROM responses r JOIN questions q ON q.id = r.question_id GROUP BY q.category_id''',
+        "INSERT OR IGNORE INTO question_stats (question_id) SELECT id FROM questions",
+        QUESTION_STATS_TRIGGER_SQL,
+        "CREATE INDEX IF NOT EXISTS idx_question_stats_attempts ON question_stats (attempts, question_id)",
+        "CREATE INDEX IF NOT EXISTS idx_question_stats_percent_correct ON question_stats (percent_correct, question_id)",
+        "CREATE INDEX IF NOT EXISTS idx_question_stats_avg_ms ON question_stats (avg_ms, question_id)",
+    ]),
+    (5, [
+        '''CREATE TABLE IF NOT EXISTS review_schedule (
+            student TEXT NOT NULL,
+            question_id INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            repetitions INTEGER NOT NULL,
+            ease REAL NOT NULL,
+            interval_days REAL NOT NULL,
+            due_at REAL NOT NULL,
+            PRIMARY KEY (student, question_id)
+        )''',
+        "CREATE INDEX IF NOT EXISTS idx_review_schedule_due ON review_schedule (student, category_id, due_at)",
+        "CREATE INDEX IF NOT EXISTS idx_review_schedule_question_id ON review_schedule (question_id)",
+        '''CREATE TABLE IF NOT EXISTS review_progress (
+            student TEXT NOT NULL,
+            category_id INTEGER NOT NULL,
+            last_new_question_id INTEGER NOT NULL,
+            seen_question_id INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (student, category_id)
+        )''',
+    ]),
+    (6, [
+        '''CREATE TABLE IF NOT EXISTS question_options (
+            question_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            option_text TEXT NOT NULL,
+            PRIMARY KEY (question_id, position)
+        ) WITHOUT ROWID''',
+        "ALTER TABLE questions ADD COLUMN correct_mask INTEGER NOT NULL DEFAULT 0",
+        backfill_question_options,
+    ]),
+    (7, [
+        '''CREATE TABLE IF NOT EXISTS question_minhash (
+            question_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL
+        )''',
+        '''CREATE TABLE IF NOT EXISTS question_lsh (
+            bucket BLOB NOT NULL,
+            question_id INTEGER NOT NULL,
+            PRIMARY KEY (bucket, question_id)
+        ) WITHOUT ROWID''',
+        backfill_question_lsh,
+    ]),
+    (8, [
+        '''CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER
+        )''',
+        *[change_trigger_sql(table, event) for table in CHANGE_LOG_TABLES for event in ("insert", "update", "delete")],
+        f'''CREATE TRIGGER IF NOT EXISTS change_log_trim AFTER INSERT ON change_log BEGIN
+            DELETE FROM change_log WHERE id <= new.id - {CHANGE_LOG_LIMIT};
+        END''',
+    ]),
+    (9, [
+        '''CREATE TABLE IF NOT EXISTS attachments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sha256 TEXT UNIQUE NOT NULL,
+            media_type TEXT NOT NULL,
+            data BLOB NOT NULL
+        )''',
+        '''CREATE TABLE IF NOT EXISTS question_attachments (
+            question_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            attachment_id INTEGER NOT NULL,
+            PRIMARY KEY (question_id, position)
+        ) WITHOUT ROWID''',
+        "CREATE INDEX IF NOT EXISTS idx_question_attachments_attachment_id ON question_attachments (attachment_id)",
+    ]),
+]
+
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+SEARCH_LIMIT = 100
+SEARCH_DEBOUNCE_MS = 250
+
+CATEGORY_ID_SQL = "SELECT id FROM categories WHERE name = ?"
+
+QUESTIONS_BY_CATEGORY_SQL = '''
+SELECT q.id, q.question_text, q.correct_mask, q.is_multiple_choice, q.feedback
+FROM categories c JOIN questions q ON q.category_id = c.id
+WHERE c.name = ?
+'''
+
+CATEGORY_COUNTS_SQL = '''
+SELECT c.name, COUNT(q.id) FROM categories c LEFT JOIN questions q ON q.category_id = c.id
+GROUP BY c.name ORDER BY c.name
+'''
+
+CATEGORY_QUESTION_IDS_SQL = '''
+SELECT q.id FROM categories c JOIN questions q ON q.category_id = c.id
+WHERE c.name = ?
+'''
+
+QUESTION_SELECT_SQL = '''
+SELECT c.name, q.id, q.question_text, q.correct_mask, q.is_multiple_choice, q.feedback,
+       IFNULL(s.attempts, 0), IFNULL(s.percent_correct, -1), IFNULL(s.avg_ms, -1)
+FROM questions q JOIN categories c ON q.category_id = c.id
+LEFT JOIN question_stats s ON s.question_id = q.id
+'''
+
+QUESTION_STATS_SELECT_SQL = '''
+SELECT c.name, q.id, q.question_text, q.correct_mask, q.is_multiple_choice, q.feedback, s.attempts, s.percent_correct, s.avg_ms
+FROM question_stats s CROSS JOIN questions q ON q.id = s.question_id JOIN categories c ON q.category_id = c.id
+'''
+
+QUESTION_ATTACHMENTS_SQL = "SELECT attachment_id FROM question_attachments WHERE question_id = ? ORDER BY position"
+
+DELETE_ORPHAN_ATTACHMENT_SQL = '''
+DELETE FROM attachments WHERE id = ? AND NOT EXISTS (SELECT 1 FROM question_attachments WHERE attachment_id = ?)
+'''
+
+SIMILAR_QUESTIONS_SQL = f'''
+SELECT question_id FROM question_lsh WHERE bucket IN ({', '.join('?' * LSH_BANDS)})
+GROUP BY question_id HAVING COUNT(*) >= ?
+'''
+
+QUESTION_BY_ID_SQL = QUESTION_SELECT_SQL.replace("\nFROM questions q", ", o.option_text\nFROM questions q") + '''JOIN question_options o ON o.question_id = q.id
+WHERE q.id = ? ORDER BY o.position
+'''
+
+OPTIONS_QUERY_CHUNK = 500
+
+QUESTION_STATS_UPDATE_SQL = [
+    "INSERT OR IGNORE INTO question_stats (question_id) VALUES (?4)",
+    '''UPDATE question_stats SET attempts = attempts + ?1, correct = correct + ?2, total_ms = total_ms + ?3,
+    percent_correct = 100.0 * (correct + ?2) / (attempts + ?1), avg_ms = 1.0 * (total_ms + ?3) / (attempts + ?1)
+    WHERE question_id = ?4''',
+    "INSERT OR IGNORE INTO category_stats (category_id) SELECT category_id FROM questions WHERE id = ?4",
+    '''UPDATE category_stats SET attempts = attempts + ?1, correct = correct + ?2, total_ms = total_ms + ?3
+    WHERE category_id = (SELECT category_id FROM questions WHERE id = ?4)''',
+]
+
+REVIEW_DUE_SQL = '''
+SELECT question_id FROM review_schedule
+WHERE student = ? AND category_id = ? AND due_at <= ?
+ORDER BY due_at LIMIT ?
+'''
+
+REVIEW_NEW_SQL = '''
+SELECT q.id FROM questions q
+WHERE q.category_id = ? AND q.id > ?
+AND NOT EXISTS (SELECT 1 FROM review_schedule r WHERE r.student = ? AND r.question_id = q.id)
+ORDER BY q.id LIMIT ?
+'''
+
+CATEGORY_MAX_ID_SQL = "SELECT MAX(id) FROM questions WHERE category_id = ?"
+
+REVIEW_UPCOMING_SQL = '''
+SELECT question_id FROM review_schedule
+WHERE student = ? AND category_id = ?
+ORDER BY due_at LIMIT ?
+'''
+
+QUESTION_PAGE_SIZE = 200
+
+QUESTION_PAGE_SQL = QUESTION_SELECT_SQL + " WHERE q.id > ? ORDER BY q.id LIMIT ?"
+
+CATEGORY_PAGE_SQL = QUESTION_SELECT_SQL + " WHERE q.category_id = ? AND q.id > ? ORDER BY q.id LIMIT ?"
+
+QUESTION_ORDER_COLUMNS = {
+    "id": "q.id",
+    "category": "c.name",
+    "question": "q.question_text",
+    "is_multiple_choice": "q.is_multiple_choice",
+    "attempts": "s.attempts",
+    "percent_correct": "s.percent_correct",
+    "avg_ms": "s.avg_ms",
+}
+
+QUESTION_STATS_ORDERS = ("attempts", "percent_correct", "avg_ms")
+
+def question_page_sql(order_by, descending=False, after=False):
+    column = QUESTION_ORDER_COLUMNS[order_by]
+    direction = "DESC" if descending else "ASC"
+    comparison = "<" if descending else ">"
+    if order_by in QUESTION_STATS_ORDERS:
+        sql, id_column = QUESTION_STATS_SELECT_SQL, "s.question_id"
+    else:
+        sql, id_column = QUESTION_SELECT_SQL, "q.id"
+    
+    if after:
+        if order_by == "id":
+            sql += f" WHERE q.id {comparison} ?"
+        else:
+            sql += f" WHERE ({column}, {id_column}) {comparison} (?, ?)"
+    
+    if order_by == "id":
+        return sql + f" ORDER BY q.id {direction} LIMIT ?"
+    return sql + f" ORDER BY {column} {direction}, {id_column} {direction} LIMIT ?"
+
+INDEXED_QUERIES = {
+    "get_category_id": (CATEGORY_ID_SQL, ("",)),
+    "get_question_attachments": (QUESTION_ATTACHMENTS_SQL, (0,)),
+    "delete_attachments": (DELETE_ORPHAN_ATTACHMENT_SQL, (0, 0)),
+    "get_questions_by_category": (QUESTIONS_BY_CATEGORY_SQL, ("",)),
+    "get_category_question_ids": (CATEGORY_QUESTION_IDS_SQL, ("",)),
+    "get_question_by_id": (QUESTION_BY_ID_SQL, (0,)),
+    **{f"get_questions_page_by_{order_by}_{'desc' if descending else 'asc'}":
+       (question_page_sql(order_by, descending, after=True), (0,) * (1 + (order_by != "id")) + (QUESTION_PAGE_SIZE,))
+       for order_by, descending in itertools.product(QUESTION_ORDER_COLUMNS, (False, True))},
+    "iter_questions": (QUESTION_PAGE_SQL, (0, QUESTION_PAGE_SIZE)),
+    "iter_category_questions": (CATEGORY_PAGE_SQL, (0, 0, QUESTION_PAGE_SIZE)),
+    "pick_review_question": (REVIEW_DUE_SQL, ("", 0, 0.0, 1)),
+    "pick_new_question": (REVIEW_NEW_SQL, (0, 0, "", 1)),
+    "pick_upcoming_question": (REVIEW_UPCOMING_SQL, ("", 0, 1)),
+    "pick_category_max_id": (CATEGORY_MAX_ID_SQL, (0,)),
+    "find_similar_questions": (SIMILAR_QUESTIONS_SQL, (0,) * LSH_BANDS + (LSH_MIN_SHARED_BANDS,)),
+}
+
+ORDERED_QUERIES = {
+    f"get_questions_first_page_by_{order_by}_{'desc' if descending else 'asc'}":
+    (question_page_sql(order_by, descending), (QUESTION_PAGE_SIZE,))
+    for order_by, descending in itertools.product(QUESTION_ORDER_COLUMNS, (False, True))
+}
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y", "multiple")
+    return bool(value)
+
+def _parse_answers(value):
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            return json.loads(value)
+        return [answer.strip() for answer in value.split("|") if answer.strip()]
+    return list(value or [])
+
+def normalize_question_record(record):
+    if "options" in record:
+        options = _parse_answers(record["options"])
+    else:
+        options = [record.get(f"option_{letter}", "") for letter in "abcd"]
+    options = [str(option or "").strip() for option in options]
+    while options and not options[-1]:
+        options.pop()
+    
+    question = {
+        "category": str(record.get("category") or "").strip(),
+        "question": str(record.get("question") or record.get("question_text") or "").strip(),
+        "options": options,
+        "answers": [str(answer).strip() for answer in _parse_answers(record.get("answers", record.get("correct_answers")))],
+        "is_multiple_choice": _parse_bool(record.get("is_multiple_choice", False)),
+        "feedback": str(record.get("feedback") or "").strip()
+    }
+    
+    if not question["category"] or not question["question"] or len(options) < MIN_OPTIONS or "" in options:
+        raise ValueError("All fields must be filled.")
+    if len(options) > MAX_OPTIONS:
+        raise ValueError(f"Questions can have at most {MAX_OPTIONS} options.")
+    if not question["answers"]:
+        raise ValueError("At least one correct answer is required.")
+    if any(answer not in options for answer in question["answers"]):
+        raise ValueError("Correct answers must match one of the options.")
+    if not question["is_multiple_choice"] and len(question["answers"]) > 1:
+        raise ValueError("Single choice questions can only have one correct answer.")
+    
+    return question
+
+def read_question_file(path):
+    extension = os.path.splitext(path)[1].lower()
+    
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    elif extension == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        yield from data["questions"] if isinstance(data, dict) else data
+    elif extension == BUNDLE_EXTENSION:
+        yield from read_question_bundle(path)
+    else:
+        raise ValueError(f"Unsupported file type: {extension}")
+
+EXPORT_FIELDS = ("category", "question", "options", "answers", "is_multiple_choice", "feedback")
+EXPORT_BATCH_SIZE = 500
+
+BUNDLE_EXTENSION = ".qbundle"
+BUNDLE_MAGIC = b"QUIZBUNDLE1\n"
+BUNDLE_TRAILER = struct.Struct(">Q12s")
+BUNDLE_CHUNK_SIZE = 65536
+
+def export_record(question):
+    return {field: question[field] for field in EXPORT_FIELDS}
+
+def _format_answers(answers):
+    if any("|" in answer or answer.startswith("[") for answer in answers):
+        return json.dumps(answers)
+    return "|".join(answers)
+
+def write_question_file(path, questions, max_options=4, progress=None):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".jsonl", ".csv"):
+        raise ValueError(f"Unsupported file type: {extension}")
+    exported = 0
+    
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if extension == ".jsonl":
+            for question in questions:
+                f.write(json.dumps(export_record(question)) + "\n")
+                exported += 1
+                if progress and exported % EXPORT_BATCH_SIZE == 0:
+                    progress(exported)
+        else:
+            option_columns = [f"option_{letter}" for letter in "abcd"] if max_options <= 4 else ["options"]
+            writer = csv.writer(f)
+            writer.writerow(["category", "question", *option_columns, "answers", "is_multiple_choice", "feedback"])
+            for question in questions:
+                options = question["options"]
+                if max_options <= 4:
+                    options = options + [""] * (4 - len(options))
+                else:
+                    options = [json.dumps(options)]
+                writer.writerow([question["category"], question["question"], *options, _format_answers(question["answers"]),
+                                 int(question["is_multiple_choice"]), question["feedback"]])
+                exported += 1
+                if progress and exported % EXPORT_BATCH_SIZE == 0:
+                    progress(exported)
+    
+    if progress:
+        progress(exported)
+    return exported
+
+def write_question_bundle(path, db, categories=None, progress=None):
+    index = []
+    exported = 0
+    
+    with open(path, "wb") as f:
+        f.write(BUNDLE_MAGIC)
+        for category in db.get_categories() if categories is None else categories:
+            offset = f.tell()
+            compressor = zlib.compressobj()
+            pending = []
+            count = 0
+            for question in db.iter_questions(category):
+                pending.append(json.dumps(export_record(question)).encode("utf-8") + b"\n")
+                count += 1
+                if len(pending) >= EXPORT_BATCH_SIZE:
+                    f.write(compressor.compress(b"".join(pending)))
+                    pending = []
+                    exported += EXPORT_BATCH_SIZE
+                    if progress:
+                        progress(exported)
+            f.write(compressor.compress(b"".join(pending)))
+            f.write(compressor.flush())
+            exported += len(pending)
+            index.append({"category": category, "offset": offset, "length": f.tell() - offset, "questions": count})
+        
+        index_offset = f.tell()
+        f.write(zlib.compress(json.dumps({"schema_version": SCHEMA_VERSION, "categories": index}).encode("utf-8")))
+        f.write(BUNDLE_TRAILER.pack(index_offset, BUNDLE_MAGIC))
+    
+    if progress:
+        progress(exported)
+    return exported
+
+def read_bundle_index(f):
+    f.seek(0)
+    if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+        raise ValueError("Not a question bundle.")
+    f.seek(-BUNDLE_TRAILER.size, os.SEEK_END)
+    trailer_offset = f.tell()
+    index_offset, magic = BUNDLE_TRAILER.unpack(f.read(BUNDLE_TRAILER.size))
+    if magic != BUNDLE_MAGIC or index_offset > trailer_offset:
+        raise ValueError("The question bundle is truncated.")
+    f.seek(index_offset)
+    return json.loads(zlib.decompress(f.read(trailer_offset - index_offset)))["categories"]
+
+def bundle_categories(path):
+    with open(path, "rb") as f:
+        return {entry["category"]: entry["questions"] for entry in read_bundle_index(f)}
+
+def read_question_bundle(path, category=None):
+    with open(path, "rb") as f:
+        index = read_bundle_index(f)
+        if category is not None:
+            index = [entry for entry in index if entry["category"] == category]
+            if not index:
+                raise ValueError(f"Category {category!r} is not in the bundle.")
+        
+        for entry in index:
+            f.seek(entry["offset"])
+            decompressor = zlib.decompressobj()
+            remaining = entry["length"]
+            buffered = b""
+            while remaining:
+                chunk = f.read(min(BUNDLE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError("The question bundle is truncated.")
+                remaining -= len(chunk)
+                lines = (buffered + decompressor.decompress(chunk)).split(b"\n")
+                buffered = lines.pop()
+                for line in lines:
+                    yield json.loads(line)
+            buffered += decompressor.flush()
+            if buffered.strip():
+                yield json.loads(buffered)
+
+def export_questions(db, path, category=None, progress=None):
+    categories = None if category is None else [category]
+    if os.path.splitext(path)[1].lower() == BUNDLE_EXTENSION:
+        return write_question_bundle(path, db, categories, progress)
+    return write_question_file(path, db.iter_questions(category), db.max_option_count(), progress)
+
+GRADING_CHUNK_SIZE = 50000
+
+class AnswerKey:
+    def __init__(self, questions):
+        questions = list(questions)
+        self.questions = [Question(question) for question in questions]
+        self.categories = [question.get("category", "") for question in questions]
+        self.index = {question.id: row for row, question in enumerate(self.questions)}
+        self.text_index = {str(question_id): row for question_id, row in self.index.items()}
+        self.option_positions = {(row, option): position for row, question in enumerate(self.questions)
+                                 for position, option in reversed(list(enumerate(question.options)))}
+        self.correct_texts = ["|".join(question.correct_answers) for question in self.questions]
+        self.correct_texts = [None if text.lstrip().startswith('[') else text for text in self.correct_texts]
+        if load_numpy():
+            self.correct_masks = np.array([question.correct_mask for question in self.questions], dtype=np.int64)
+            self.is_multiple_choice = np.array([question.is_multiple_choice for question in self.questions], dtype=bool)
+            self.option_counts = np.array([len(question.options) for question in self.questions], dtype=np.int64)
+            self.option_ids = {"": 0}
+            for question in self.questions:
+                for option in question.options:
+                    self.option_ids.setdefault(option, len(self.option_ids))
+            option_keys = {row * (len(self.option_ids) + 1) + self.option_ids[option]: position
+                           for (row, option), position in self.option_positions.items()}
+            self.option_keys = np.array(sorted(option_keys), dtype=np.int64)
+            self.option_key_positions = np.array([option_keys[option_key] for option_key in self.option_keys.tolist()], dtype=np.int64)
+    
+    @classmethod
+    def from_database(cls, db, category_name=None):
+        return cls(db.iter_questions(category_name))
+    
+    def answer_mask(self, row, answers):
+        answers = answers.strip()
+        if answers.startswith('['):
+            return self.questions[row].answer_mask([str(answer).strip() for answer in json.loads(answers)])
+        
+        unknown = len(self.questions[row].options)
+        mask = 0
+        for answer in answers.split("|"):
+            answer = answer.strip()
+            if answer:
+                mask |= 1 << self.option_positions.get((row, answer), unknown)
+                if not self.questions[row].is_multiple_choice:
+                    break
+        return mask
+    
+    def question_rows(self, row_numbers, question_ids):
+        index = self.text_index if question_ids and isinstance(question_ids[0], str) else self.index
+        question_rows = list(map(index.get, question_ids))
+        if None in question_rows:
+            for position, question_id in enumerate(question_ids):
+                if question_rows[position] is None:
+                    try:
+                        question_rows[position] = self.index[int(question_id)]
+                    except KeyError as e:
+                        raise ValueError(f"Row {row_numbers[position]}: unknown question id {question_id!r}") from e
+                    except (ValueError, TypeError) as e:
+                        raise ValueError(f"Row {row_numbers[position]}: {e}") from e
+        return question_rows
+    
+    def answer_masks(self, row_numbers, question_rows, answers):
+        masks = []
+        for row_number, row, response in zip(row_numbers, question_rows, answers):
+            if response == self.correct_texts[row]:
+                masks.append(self.questions[row].correct_mask)
+                continue
+            try:
+                masks.append(self.answer_mask(row, response))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Row {row_number}: {e}") from e
+        return masks
+    
+    def answer_masks_numpy(self, row_numbers, question_rows, answers):
+        rows = np.array(question_rows, dtype=np.int64)
+        matched = np.fromiter(map(operator.eq, answers, map(self.correct_texts.__getitem__, question_rows)),
+                              dtype=bool, count=len(answers))
+        masks = np.where(matched, self.correct_masks[rows], 0)
+        pending = np.flatnonzero(~matched).tolist()
+        if not pending:
+            return masks
+        
+        pending_answers = list(map(answers.__getitem__, pending))
+        masks[pending] = self.token_masks(rows[pending], pending_answers)
+        if "[" in "".join(pending_answers):
+            for position, response in zip(pending, pending_answers):
+                if response.lstrip().startswith('['):
+                    try:
+                        masks[position] = self.answer_mask(question_rows[position], response)
+                    except (ValueError, TypeError) as e:
+                        raise ValueError(f"Row {row_numbers[position]}: {e}") from e
+        return masks
+    
+    def token_masks(self, question_rows, answers):
+        counts = np.fromiter(map(operator.methodcaller("count", "|"), answers), dtype=np.int64, count=len(answers)) + 1
+        starts = np.cumsum(counts) - counts
+        token_rows = np.repeat(question_rows, counts)
+        option_ids = np.fromiter(map(self.option_ids.get, map(str.strip, "|".join(answers).split("|")), itertools.repeat(-1)),
+                                 dtype=np.int64, count=len(token_rows))
+        
+        option_keys = token_rows * (len(self.option_ids) + 1) + option_ids
+        found = np.minimum(np.searchsorted(self.option_keys, option_keys), len(self.option_keys) - 1)
+        positions = np.where(self.option_keys[found] == option_keys, self.option_key_positions[found], self.option_counts[token_rows])
+        answered = option_ids != 0
+        seen = np.cumsum(answered)
+        first = seen - np.repeat(seen[starts] - answered[starts], counts) == 1
+        chosen = answered & (self.is_multiple_choice[token_rows] | first)
+        return np.bitwise_or.reduceat(np.where(chosen, np.left_shift(1, positions), 0), starts)
+
+def grade_chunk(key, columns, use_numpy=True):
+    row_numbers, chunk_students, question_ids, answers = columns
+    question_rows = key.question_rows(row_numbers, question_ids)
+    
+    students = {}
+    student_ids = {student: students.setdefault(str(student or "").strip(), len(students))
+                   for student in dict.fromkeys(chunk_students)}
+    student_rows = list(map(student_ids.__getitem__, chunk_students))
+    
+    if use_numpy and load_numpy():
+        masks = key.answer_masks_numpy(row_numbers, question_rows, answers)
+        question_rows = np.array(question_rows, dtype=np.int64)
+        correct_masks = key.correct_masks[question_rows]
+        answered = masks != 0
+        correct = answered & np.where(key.is_multiple_choice[question_rows], masks == correct_masks,
+                                      (masks & correct_masks) == masks)
+        return list(students), np.array(student_rows, dtype=np.int64), question_rows, correct, answered
+    
+    masks = key.answer_masks(row_numbers, question_rows, answers)
+    results = [key.questions[row].validate_mask(mask) for row, mask in zip(question_rows, masks)]
+    return list(students), student_rows, question_rows, [bool(result) for result in results], [result is not None for result in results]
+
+SUBMISSION_FIELDS = ("student", "question_id", "answers")
+
+def submission_answers(answers):
+    return answers if isinstance(answers, str) else json.dumps(answers or [])
+
+def submission_row(row_number, record):
+    return row_number, record.get("student"), record.get("question_id"), submission_answers(record.get("answers"))
+
+def submission_columns(rows):
+    return tuple(zip(*rows)) if rows else ((), (), (), ())
+
+def read_submission_chunks(path, chunk_size=GRADING_CHUNK_SIZE):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".csv", ".jsonl"):
+        raise ValueError(f"Unsupported file type: {extension}")
+    
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        columns = None
+        line_number = 1
+        if extension == ".csv":
+            header = next(csv.reader([f.readline()]), [])
+            if any(field not in header for field in SUBMISSION_FIELDS):
+                raise ValueError(f"Submission files need {', '.join(SUBMISSION_FIELDS)} columns.")
+            columns = [header.index(field) for field in SUBMISSION_FIELDS]
+            line_number = 2
+        
+        while True:
+            lines = f.readlines(chunk_size * 64)
+            if not lines:
+                return
+            if columns:
+                while sum(line.count('"') for line in lines) % 2:
+                    line = f.readline()
+                    if not line:
+                        break
+                    lines.append(line)
+            yield columns, line_number, "".join(lines)
+            line_number += len(lines)
+
+def parse_submission_chunk(columns, line_number, text):
+    if columns:
+        reader = csv.reader(io.StringIO(text, newline=""))
+        pick = operator.itemgetter(*columns)
+        return submission_columns([(line_number + reader.line_num - 1, *pick(row)) for row in reader if row])
+    
+    rows = []
+    for offset, line in enumerate(text.split("\n")):
+        if line.strip():
+            record = json.loads(line)
+            rows.append(submission_row(line_number + offset, record))
+    return submission_columns(rows)
+
+_grading_key = None
+
+def _init_grading_worker(key):
+    global _grading_key
+    _grading_key = key
+
+def _grade_worker_chunk(chunk, use_numpy=True):
+    return grade_chunk(_grading_key, parse_submission_chunk(*chunk), use_numpy)
+
+def grade_submissions(key, records, use_numpy=True):
+    use_numpy = use_numpy and bool(load_numpy())
+    records = list(records)
+    students, question_ids, answers = ([record.get(field) for record in records] for field in SUBMISSION_FIELDS)
+    if set(map(type, answers)) - {str}:
+        answers = list(map(submission_answers, answers))
+    columns = (range(1, len(records) + 1), students, question_ids, answers)
+    return combine_grades(key, [grade_chunk(key, columns, use_numpy)], use_numpy)
+
+def grade_submission_file(key, path, workers=None, chunk_size=GRADING_CHUNK_SIZE, use_numpy=True):
+    use_numpy = use_numpy and bool(load_numpy())
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return combine_grades(key, [grade_chunk(key, parse_submission_chunk(*chunk), use_numpy)
+                                    for chunk in read_submission_chunks(path, chunk_size)], use_numpy)
+    
+    chunks = []
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_grading_worker,
+                                                initargs=(key,)) as executor:
+        for chunk in read_submission_chunks(path, chunk_size):
+            pending.append(executor.submit(_grade_worker_chunk, chunk, use_numpy))
+            if len(pending) >= workers * 2:
+                chunks.append(pending.popleft().result())
+        chunks.extend(future.result() for future in pending)
+    return combine_grades(key, chunks, use_numpy)
+
+def combine_grades(key, chunks, use_numpy):
+    student_ids = {}
+    remapped = []
+    for chunk_students, student_rows, question_rows, correct, answered in chunks:
+        remap = [student_ids.setdefault(student, len(student_ids)) for student in chunk_students]
+        if use_numpy:
+            remapped.append((np.array(remap, dtype=np.int64)[student_rows], question_rows, correct, answered))
+        else:
+            remapped.append(([remap[student_row] for student_row in student_rows], question_rows, correct, answered))
+    
+    if use_numpy:
+        student_totals, item_totals = _grade_totals_numpy(remapped, len(student_ids), len(key.questions))
+    else:
+        student_totals, item_totals = _grade_totals_python(remapped, len(student_ids), len(key.questions))
+    
+    students = [{
+        "student": student,
+        "questions": questions,
+        "correct": correct,
+        "unanswered": unanswered,
+        "percent": 100.0 * correct / questions,
+    } for student, (questions, correct, unanswered) in zip(student_ids, student_totals)]
+    
+    items = []
+    for row, (responses, correct, unanswered, sum_x, sum_y, sum_xy, sum_yy) in enumerate(item_totals):
+        if not responses:
+            continue
+        question = key.questions[row]
+        variance = (responses * sum_x - sum_x * sum_x) * (responses * sum_yy - sum_y * sum_y)
+        items.append({
+            "id": question.id,
+            "category": key.categories[row],
+            "question": question.question_text,
+            "responses": responses,
+            "correct": correct,
+            "unanswered": unanswered,
+            "percent_correct": 100.0 * correct / responses,
+            "discrimination": (responses * sum_xy - sum_x * sum_y) / variance ** 0.5 if variance > 0 else None,
+        })
+    
+    return {"answers": sum(student["questions"] for student in students), "students": students, "items": items}
+
+def _grade_totals_numpy(chunks, student_count, question_count):
+    student_rows = np.concatenate([chunk[0] for chunk in chunks]) if chunks else np.zeros(0, dtype=np.int64)
+    question_rows = np.concatenate([chunk[1] for chunk in chunks]) if chunks else np.zeros(0, dtype=np.int64)
+    correct = np.concatenate([chunk[2] for chunk in chunks]) if chunks else np.zeros(0, dtype=bool)
+    answered = np.concatenate([chunk[3] for chunk in chunks]) if chunks else np.zeros(0, dtype=bool)
+    
+    student_correct = np.bincount(student_rows[correct], minlength=student_count)
+    student_totals = zip(np.bincount(student_rows, minlength=student_count).tolist(), student_correct.tolist(),
+                         np.bincount(student_rows[~answered], minlength=student_count).tolist())
+    
+    x = correct.astype(np.float64)
+    y = student_correct[student_rows] - x
+    item_totals = zip(np.bincount(question_rows, minlength=question_count).tolist(),
+                      np.bincount(question_rows[correct], minlength=question_count).tolist(),
+                      np.bincount(question_rows[~answered], minlength=question_count).tolist(),
+                      *(np.bincount(question_rows, weights=weights, minlength=question_count).tolist()
+                        for weights in (x, y, x * y, y * y)))
+    return list(student_totals), list(item_totals)
+
+def _grade_totals_python(chunks, student_count, question_count):
+    student_totals = [[0, 0, 0] for _ in range(student_count)]
+    for student_rows, question_rows, correct, answered in chunks:
+        for student_row, is_correct, is_answered in zip(student_rows, correct, answered):
+            totals = student_totals[student_row]
+            totals[0] += 1
+            totals[1] += is_correct
+            totals[2] += not is_answered
+    
+    item_totals = [[0, 0, 0, 0.0, 0.0, 0.0, 0.0] for _ in range(question_count)]
+    for student_rows, question_rows, correct, answered in chunks:
+        for student_row, question_row, is_correct, is_answered in zip(student_rows, question_rows, correct, answered):
+            x = float(is_correct)
+            y = student_totals[student_row][1] - x
+            totals = item_totals[question_row]
+            totals[0] += 1
+            totals[1] += is_correct
+            totals[2] += not is_answered
+            totals[3] += x
+            totals[4] += y
+            totals[5] += x * y
+            totals[6] += y * y
+    return student_totals, item_totals
+
+def write_grade_report(report, students_path, items_path):
+    with open(students_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student", "questions", "correct", "unanswered", "percent"])
+        for student in report["students"]:
+            writer.writerow([student["student"], student["questions"], student["correct"], student["unanswered"],
+                             f"{student['percent']:.1f}"])
+    
+    with open(items_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "category", "question", "responses", "correct", "unanswered", "percent_correct", "discrimination"])
+        for item in report["items"]:
+            writer.writerow([item["id"], item["category"], item["question"], item["responses"], item["correct"], item["unanswered"],
+                             f"{item['percent_correct']:.1f}",
+                             "" if item["discrimination"] is None else f"{item['discrimination']:.3f}"])
+
+def write_duplicate_report(report, f):
+    writer = csv.writer(f)
+    writer.writerow(["group", "id", "category", "similarity", "question"])
+    for group_number, group in enumerate(report, 1):
+        for question in group:
+            writer.writerow([group_number, question["id"], question["category"], f"{question['similarity']:.2f}", question["question"]])
+
+HISTOGRAM_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+INSTRUMENTED_DB_METHODS = (
+    "get_categories", "get_category_counts", "add_category", "get_category_id", "add_question", "get_questions_by_category",
+    "get_category_question_ids", "sample_question_ids", "sample_questions", "get_question_by_id", "get_questions_page",
+    "get_all_questions", "update_question", "delete_question", "import_questions", "search",
+    "start_attempt", "record_responses", "get_question_stats", "get_category_stats",
+    "schedule_questions", "pick_review_question", "apply_reviews",
+    "find_similar_questions", "find_duplicate_questions", "get_questions_by_ids", "poll_changes",
+    "get_attachment", "add_attachment", "remove_attachments",
+)
+
+INSTRUMENTED_SCREENS = (
+    "show_welcome_screen", "show_category_selection", "show_quiz_question", "show_quiz_results", "show_admin_panel",
+    "show_diagnostics", "show_duplicate_report", "show_add_category_form", "show_add_question_form", "show_view_questions",
+    "build_edit_question_form",
+)
+
+class Instrumentation:
+    def __init__(self):
+        self.timings = {}
+        self.statement_count = 0
+        self.profile_screen = None
+        self.profiles = []
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def requested(argv=None):
+        argv = sys.argv if argv is None else argv
+        return "--instrument" in argv or os.environ.get("QUIZ_INSTRUMENT", "") not in ("", "0")
+    
+    def record(self, kind, name, elapsed_ms):
+        with self._lock:
+            timing = self.timings.get((kind, name))
+            if timing is None:
+                timing = self.timings[(kind, name)] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                                       "buckets": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)}
+            timing["count"] += 1
+            timing["total_ms"] += elapsed_ms
+            timing["max_ms"] = max(timing["max_ms"], elapsed_ms)
+            timing["buckets"][bisect.bisect_left(HISTOGRAM_BUCKETS_MS, elapsed_ms)] += 1
+    
+    def count_statement(self, statement):
+        with self._lock:
+            self.statement_count += 1
+    
+    def reset(self):
+        with self._lock:
+            self.timings = {}
+            self.statement_count = 0
+            self.profiles = []
+    
+    def wrap(self, kind, name, function):
+        def timed_call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(kind, name, (time.perf_counter() - start) * 1000)
+        return timed_call
+    
+    def wrap_screen(self, name, function, root):
+        def timed_screen(*args, **kwargs):
+            profiler = None
+            if self.profile_screen == name:
+                self.profile_screen = None
+                import cProfile
+                profiler = cProfile.Profile()
+                profiler.enable()
+            
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                root.update_idletasks()
+                self.record("screen", name, (time.perf_counter() - start) * 1000)
+                if profiler:
+                    profiler.disable()
+                    self.save_profile(name, profiler)
+        return timed_screen
+    
+    def save_profile(self, name, profiler):
+        path = f"profile_{name}_{time.strftime('%Y%m%d_%H%M%S')}.prof"
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        import pstats
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(20)
+        with self._lock:
+            self.profiles.append({"screen": name, "path": path, "summary": summary.getvalue()})
+    
+    def instrument_database(self, db):
+        for name in INSTRUMENTED_DB_METHODS:
+            if hasattr(db, name):
+                setattr(db, name, self.wrap("db", name, getattr(db, name)))
+        if hasattr(db, "set_trace_callback"):
+            db.set_trace_callback(self.count_statement)
+    
+    def instrument_app(self, app):
+        for name in INSTRUMENTED_SCREENS:
+            if hasattr(app, name):
+                setattr(app, name, self.wrap_screen(name, getattr(app, name), app.root))
+    
+    def snapshot(self, db=None):
+        with self._lock:
+            rows = []
+            for (kind, name), timing in sorted(self.timings.items()):
+                rows.append(dict(timing, kind=kind, name=name, buckets=list(timing["buckets"]),
+                                 mean_ms=timing["total_ms"] / timing["count"]))
+            return {
+                "statement_count": self.statement_count,
+                "connections_opened": db.connections_opened if db else None,
+                "bucket_bounds_ms": list(HISTOGRAM_BUCKETS_MS),
+                "timings": rows,
+                "profiles": [{"screen": p["screen"], "path": p["path"]} for p in self.profiles]
+            }
+    
+    def dump(self, path, db=None):
+        snapshot = self.snapshot(db)
+        if path.lower().endswith(".csv"):
+            bucket_names = [f"le_{bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + ["gt_max"]
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["kind", "name", "count", "total_ms", "mean_ms", "max_ms"] + bucket_names)
+                for row in snapshot["timings"]:
+                    writer.writerow([row["kind"], row["name"], row["count"], round(row["total_ms"], 3),
+                                     round(row["mean_ms"], 3), round(row["max_ms"], 3)] + row["buckets"])
+                writer.writerow(["sql", "statements", snapshot["statement_count"]])
+                writer.writerow(["sql", "connections_opened", snapshot["connections_opened"]])
+        else:
+            with open(path, "w") as f:
+                json.dump(snapshot, f, indent=2)
+        return path
+
+class QuizDatabase:
+    allows_admin = True
+    tracks_changes = True
+    
+    def __init__(self, db_file="quiz_database.db", cache_size_kb=8192, read_only=False):
+        self.db_file = db_file
+        self.cache_size_kb = cache_size_kb
+        self.read_only = read_only
+        self.connections_opened = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._category_question_ids = {}
+        self._category_counts = None
+        self._change_id = None
+        self._has_fts = None
+        self.trace_callback = None
+        
+        conn = self._get_connection()
+        if not read_only and conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._create_schema(conn)
+    
+    @property
+    def has_fts(self):
+        if self._has_fts is None:
+            conn = self._get_connection()
+            self._has_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'questions_fts'").fetchone() is not None
+        return self._has_fts
+    
+    def _create_schema(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if schema_version == 0:
+            self._create_tables(conn, cursor)
+        
+        for version, statements in SCHEMA_MIGRATIONS:
+            if version > schema_version:
+                try:
+                    for statement in statements:
+                        if isinstance(statement, str):
+                            cursor.execute(statement)
+                        else:
+                            statement(cursor)
+                except sqlite3.OperationalError as e:
+                    if "fts5" not in str(e):
+                        raise
+                cursor.execute(f"PRAGMA user_version = {version}")
+        
+        conn.commit()
+    
+    def _create_tables(self, conn, cursor):
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )''')
+        
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_id INTEGER NOT NULL,
+            question_text TEXT NOT NULL,
+            option_a TEXT NOT NULL,
+            option_b TEXT NOT NULL,
+            option_c TEXT NOT NULL,
+            option_d TEXT NOT NULL,
+            correct_answers TEXT NOT NULL,
+            is_multiple_choice BOOLEAN NOT NULL DEFAULT 0,
+            feedback TEXT,
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )''')
+        
+        cursor.execute("PRAGMA table_info(questions)")
+        columns = [info[1] for info in cursor.fetchall()]
+        
+        if "feedback" not in columns:
+            cursor.execute("ALTER TABLE questions ADD COLUMN feedback TEXT")
+        
+        if "correct_answer" in columns and "correct_answers" not in columns:
+            self._migrate_database(conn, cursor)
+    
+    def _open(self):
+        conn = sqlite3.connect(self.db_file, cached_statements=256, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if self.read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+    
+    def _connect(self):
+        conn = self._open()
+        if self.trace_callback:
+            conn.set_trace_callback(self.trace_callback)
+        with self._lock:
+            self.connections_opened += 1
+            self._connections.append(conn)
+        return conn
+    
+    def _get_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+    
+    def set_trace_callback(self, callback):
+        with self._lock:
+            self.trace_callback = callback
+            for conn in self._connections:
+                conn.set_trace_callback(callback)
+    
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+        self._local = threading.local()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _migrate_database(self, conn, cursor):
+        cursor.execute("ALTER TABLE questions ADD COLUMN correct_answers TEXT")
+        cursor.execute("ALTER TABLE questions ADD COLUMN is_multiple_choice BOOLEAN NOT NULL DEFAULT 0")
+        
+        cursor.execute("UPDATE questions SET correct_answers = correct_answer, is_multiple_choice = 0")
+        
+        cursor.execute("CREATE TABLE questions_new AS SELECT id, category_id, question_text, option_a, option_b, option_c, option_d, correct_answers, is_multiple_choice, feedback FROM questions")
+        cursor.execute("DROP TABLE questions")
+        cursor.execute("ALTER TABLE questions_new RENAME TO questions")
+        
+        conn.commit()
+    
+    def get_categories(self):
+        conn = self._get_connection()
+        return [row[0] for row in conn.execute("SELECT name FROM categories")]
+    
+    def get_category_counts(self):
+        category_counts = self._category_counts
+        if category_counts is None:
+            conn = self._get_connection()
+            category_counts = conn.execute(CATEGORY_COUNTS_SQL).fetchall()
+            self._category_counts = category_counts
+        return category_counts
+    
+    def add_category(self, category_name):
+        conn = self._get_connection()
+        try:
+            with conn:
+                conn.execute("INSERT INTO categories (name) VALUES (?)", (category_name,))
+        except sqlite3.IntegrityError:
+            return False
+        self._category_counts = None
+        return True
+    
+    def get_category_id(self, category_name):
+        conn = self._get_connection()
+        result = conn.execute(CATEGORY_ID_SQL, (category_name,)).fetchone()
+        return result[0] if result else None
+    
+    def add_question(self, category_name, question_text, options, correct_answers, is_multiple_choice, feedback=""):
+        correct_answers_json = json.dumps(correct_answers)
+        correct_mask = encode_answers(options, correct_answers)
+        
+        conn = self._get_connection()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (category_name,))
+            category_id = conn.execute(CATEGORY_ID_SQL, (category_name,)).fetchone()[0]
+            question_id = conn.execute(INSERT_QUESTION_SQL, (category_id, question_text, *legacy_options(options), join_options(options),
+                                                             correct_answers_json, correct_mask, is_multiple_choice, feedback)).lastrowid
+            conn.executemany(INSERT_OPTION_SQL, [(question_id, position, option) for position, option in enumerate(options)])
+            self._insert_lsh_rows(conn, question_id, question_text, options)
+        self._category_question_ids.pop(category_name, None)
+        self._category_counts = None
+        return question_id
+    
+    def get_questions_by_category(self, category_name):
+        conn = self._get_connection()
+        rows = conn.execute(QUESTIONS_BY_CATEGORY_SQL, (category_name,)).fetchall()
+        options = self._get_options(conn, [row[0] for row in rows])
+        
+        questions = []
+        for row in rows:
+            question_options = options[row[0]]
+            questions.append({
+                "question": row[1],
+                "options": question_options,
+                "answers": decode_answers(question_options, row[2]),
+                "is_multiple_choice": bool(row[3]),
+                "feedback": row[4] or ""
+            })
+        
+        return questions
+    
+    def _get_options(self, conn, question_ids=None):
+        if question_ids is None:
+            options = {}
+            for question_id, option_text in conn.execute("SELECT question_id, option_text FROM question_options ORDER BY question_id, position"):
+                options.setdefault(question_id, []).append(option_text)
+            return options
+        
+        options = {question_id: [] for question_id in question_ids}
+        for start in range(0, len(question_ids), OPTIONS_QUERY_CHUNK):
+            chunk = question_ids[start:start + OPTIONS_QUERY_CHUNK]
+            cursor = conn.execute(f'''
+            SELECT question_id, option_text FROM question_options
+            WHERE question_id IN ({', '.join('?' * len(chunk))}) ORDER BY question_id, position
+            ''', chunk)
+            for question_id, option_text in cursor:
+                options[question_id].append(option_text)
+        return options
+    
+    def _question_from_row(self, row, options):
+        return {
+            "category": row[0],
+            "id": row[1],
+            "question": row[2],
+            "options": options,
+            "answers": decode_answers(options, row[3]),
+            "correct_mask": row[3],
+            "is_multiple_choice": bool(row[4]),
+            "feedback": row[5] or "",
+            "attempts": row[6],
+            "percent_correct": row[7],
+            "avg_ms": row[8]
+        }
+    
+    def _questions_from_rows(self, conn, rows, all_options=False):
+        options = self._get_options(conn, None if all_options else [row[1] for row in rows])
+        return [self._question_from_row(row, options.get(row[1], [])) for row in rows]
+    
+    def get_all_questions(self):
+        conn = self._get_connection()
+        return self._questions_from_rows(conn, conn.execute(QUESTION_SELECT_SQL).fetchall(), all_options=True)
+    
+    def iter_questions(self, category_name=None, batch_size=EXPORT_BATCH_SIZE):
+        conn = self._get_connection()
+        if category_name is None:
+            sql = QUESTION_PAGE_SQL
+            params = []
+        else:
+            category_id = self.get_category_id(category_name)
+            if category_id is None:
+                return
+            sql = CATEGORY_PAGE_SQL
+            params = [category_id]
+        
+        last_id = 0
+        while True:
+            rows = conn.execute(sql, params + [last_id, batch_size]).fetchall()
+            yield from self._questions_from_rows(conn, rows)
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][1]
+    
+    def max_option_count(self):
+        conn = self._get_connection()
+        return conn.execute("SELECT IFNULL(MAX(position) + 1, 0) FROM question_options").fetchone()[0]
+    
+    def get_category_question_ids(self, category_name):
+        question_ids = self._category_question_ids.get(category_name)
+        if question_ids is None:
+            conn = self._get_connection()
+            question_ids = [row[0] for row in conn.execute(CATEGORY_QUESTION_IDS_SQL, (category_name,))]
+            self._category_question_ids[category_name] = question_ids
+        return question_ids
+    
+    def sample_question_ids(self, category_name, n=None, seed=None):
+        question_ids = self.get_category_question_ids(category_name)
+        count = len(question_ids) if n is None else min(n, len(question_ids))
+        return random.Random(seed).sample(question_ids, count)
+    
+    def sample_questions(self, category_name, n=None, seed=None):
+        return QuestionSequence(self, self.sample_question_ids(category_name, n, seed))
+    
+    def get_question_by_id(self, question_id):
+        conn = self._get_connection()
+        rows = conn.execute(QUESTION_BY_ID_SQL, (question_id,)).fetchall()
+        if not rows:
+            return None
+        question = self._question_from_row(rows[0], [row[9] for row in rows])
+        question["attachments"] = self._get_attachment_ids(conn, question_id)
+        return question
+    
+    def get_questions_by_ids(self, question_ids):
+        conn = self._get_connection()
+        return list(self._get_questions(conn, sorted(question_ids)).values())
+    
+    def get_questions_page(self, after_id=None, limit=QUESTION_PAGE_SIZE, order_by="id", descending=False, after_value=None):
+        if order_by not in QUESTION_ORDER_COLUMNS:
+            raise ValueError(f"Cannot order questions by {order_by!r}")
+        
+        params = []
+        if after_id is not None:
+            if order_by != "id":
+                params.append(after_value)
+            params.append(after_id)
+        params.append(limit)
+        
+        sql = question_page_sql(order_by, descending, after_id is not None)
+        conn = self._get_connection()
+        return self._questions_from_rows(conn, conn.execute(sql, params).fetchall())
+    
+    def update_question(self, question_id, question_text, options, correct_answers, is_multiple_choice, feedback=""):
+        correct_answers_json = json.dumps(correct_answers)
+        correct_mask = encode_answers(options, correct_answers)
+        
+        conn = self._get_connection()
+        with conn:
+            self._delete_lsh_rows(conn, question_id)
+            conn.execute('''
+            UPDATE questions 
+            SET question_text = ?, option_a = ?, option_b = ?, option_c = ?, option_d = ?, options_text = ?, correct_answers = ?, correct_mask = ?, is_multiple_choice = ?, feedback = ?
+            WHERE id = ?
+            ''', (question_text, *legacy_options(options), join_options(options), correct_answers_json, correct_mask, is_multiple_choice,
+                  feedback, question_id))
+            conn.execute("DELETE FROM question_options WHERE question_id = ?", (question_id,))
+            conn.executemany(INSERT_OPTION_SQL, [(question_id, position, option) for position, option in enumerate(options)])
+            self._insert_lsh_rows(conn, question_id, question_text, options)
+    
+    def delete_question(self, question_id):
+        conn = self._get_connection()
+        with conn:
+            self._delete_lsh_rows(conn, question_id)
+            conn.execute("DELETE FROM questions WHERE id = ?", (question_id,))
+            conn.execute("DELETE FROM question_stats WHERE question_id = ?", (question_id,))
+            conn.execute("DELETE FROM question_options WHERE question_id = ?", (question_id,))
+            conn.execute("DELETE FROM review_schedule WHERE question_id = ?", (question_id,))
+            conn.execute("DELETE FROM question_minhash WHERE question_id = ?", (question_id,))
+            self._delete_attachments(conn, question_id)
+        self._category_question_ids.clear()
+        self._category_counts = None
+    
+    def _get_attachment_ids(self, conn, question_id):
+        return [row[0] for row in conn.execute(QUESTION_ATTACHMENTS_SQL, (question_id,))]
+    
+    def get_question_attachments(self, question_id):
+        return self._get_attachment_ids(self._get_connection(), question_id)
+    
+    def get_attachment(self, attachment_id):
+        conn = self._get_connection()
+        row = conn.execute("SELECT media_type, data FROM attachments WHERE id = ?", (attachment_id,)).fetchone()
+        return tuple(row) if row else None
+    
+    def add_attachment(self, question_id, data, media_type=None):
+        media_type = media_type or attachment_media_type(data)
+        digest = hashlib.sha256(data).hexdigest()
+        conn = self._get_connection()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO attachments (sha256, media_type, data) VALUES (?, ?, ?)", (digest, media_type, data))
+            attachment_id = conn.execute("SELECT id FROM attachments WHERE sha256 = ?", (digest,)).fetchone()[0]
+            conn.execute('''
+            INSERT INTO question_attachments (question_id, position, attachment_id)
+            SELECT ?, IFNULL(MAX(position) + 1, 0), ? FROM question_attachments WHERE question_id = ?
+            ''', (question_id, attachment_id, question_id))
+        return attachment_id
+    
+    def remove_attachments(self, question_id):
+        conn = self._get_connection()
+        with conn:
+            self._delete_attachments(conn, question_id)
+    
+    def _delete_attachments(self, conn, question_id):
+        attachment_ids = self._get_attachment_ids(conn, question_id)
+        conn.execute("DELETE FROM question_attachments WHERE question_id = ?", (question_id,))
+        conn.executemany(DELETE_ORPHAN_ATTACHMENT_SQL, [(attachment_id, attachment_id) for attachment_id in attachment_ids])
+    
+    def poll_changes(self):
+        conn = self._get_connection()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == getattr(self._local, "data_version", None):
+            return None
+        self._local.data_version = data_version
+        
+        change_id = self._change_id
+        if change_id is None:
+            self._change_id = conn.execute("SELECT IFNULL(MAX(id), 0) FROM change_log").fetchone()[0]
+            return None
+        
+        rows = conn.execute("SELECT id, table_name, row_id FROM change_log WHERE id > ? ORDER BY id", (change_id,)).fetchall()
+        if not rows:
+            return None
+        
+        if rows[0][0] > change_id + 1:
+            changes = dict.fromkeys(CHANGE_LOG_TABLES)
+        else:
+            changes = {}
+            for _, table_name, row_id in rows:
+                if row_id is None:
+                    changes[table_name] = None
+                elif changes.get(table_name, ()) is not None:
+                    changes.setdefault(table_name, set()).add(row_id)
+        
+        with self._lock:
+            self._change_id = max(self._change_id, rows[-1][0])
+        self._category_question_ids.clear()
+        self._category_counts = None
+        return changes
+    
+    def _insert_lsh_rows(self, conn, question_id, question_text, options):
+        signature = minhash_signature(question_text, options)
+        conn.execute(INSERT_MINHASH_SQL, (question_id, signature))
+        conn.executemany(INSERT_LSH_SQL, lsh_rows(question_id, signature))
+    
+    def _delete_lsh_rows(self, conn, question_id):
+        row = conn.execute("SELECT signature FROM question_minhash WHERE question_id = ?", (question_id,)).fetchone()
+        if row:
+            conn.executemany("DELETE FROM question_lsh WHERE bucket = ? AND question_id = ?", lsh_rows(question_id, row[0]))
+    
+    def _get_signatures(self, conn, question_ids=None):
+        if question_ids is None:
+            return dict(conn.execute("SELECT question_id, signature FROM question_minhash"))
+        
+        signatures = {}
+        for start in range(0, len(question_ids), OPTIONS_QUERY_CHUNK):
+            chunk = question_ids[start:start + OPTIONS_QUERY_CHUNK]
+            signatures.update(conn.execute(f'''
+            SELECT question_id, signature FROM question_minhash WHERE question_id IN ({', '.join('?' * len(chunk))})
+            ''', chunk))
+        return signatures
+    
+    def _get_questions(self, conn, question_ids):
+        questions = {}
+        for start in range(0, len(question_ids), OPTIONS_QUERY_CHUNK):
+            chunk = question_ids[start:start + OPTIONS_QUERY_CHUNK]
+            rows = conn.execute(QUESTION_SELECT_SQL + f" WHERE q.id IN ({', '.join('?' * len(chunk))})", chunk).fetchall()
+            questions.update((question["id"], question) for question in self._questions_from_rows(conn, rows))
+        return questions
+    
+    def find_similar_questions(self, question_text, options, exclude_id=None, threshold=DUPLICATE_SIMILARITY, limit=5):
+        signature = minhash_signature(question_text, options)
+        buckets = lsh_buckets(signature)
+        conn = self._get_connection()
+        candidate_ids = [row[0] for row in conn.execute(SIMILAR_QUESTIONS_SQL, (*buckets, LSH_MIN_SHARED_BANDS))
+                         if row[0] != exclude_id]
+        
+        similarities = {}
+        for question_id, candidate in self._get_signatures(conn, candidate_ids).items():
+            similarity = signature_similarity(signature, candidate)
+            if similarity >= threshold:
+                similarities[question_id] = similarity
+        
+        best = sorted(similarities, key=lambda question_id: (-similarities[question_id], question_id))[:limit]
+        questions = self._get_questions(conn, best)
+        return [dict(questions[question_id], similarity=similarities[question_id]) for question_id in best if question_id in questions]
+    
+    def find_duplicate_questions(self, threshold=DUPLICATE_SIMILARITY):
+        conn = self._get_connection()
+        buckets = [[int(question_id) for question_id in members.split(",")] for members, in conn.execute('''
+        SELECT group_concat(question_id) FROM question_lsh GROUP BY bucket HAVING COUNT(*) > 1
+        ''')]
+        signatures = self._get_signatures(conn)
+        
+        parents = {}
+        def find(question_id):
+            root = question_id
+            while parents.setdefault(root, root) != root:
+                root = parents[root]
+            while question_id != root:
+                parents[question_id], question_id = root, parents[question_id]
+            return root
+        
+        for members in buckets:
+            members = sorted(question_id for question_id in members if question_id in signatures)
+            for question_id in members[1:]:
+                if signature_similarity(signatures[members[0]], signatures[question_id]) >= threshold:
+                    first, second = find(members[0]), find(question_id)
+                    if first != second:
+                        parents[max(first, second)] = min(first, second)
+        
+        groups = {}
+        for question_id in parents:
+            groups.setdefault(find(question_id), []).append(question_id)
+        questions = self._get_questions(conn, sorted(parents))
+        
+        report = []
+        for root, members in groups.items():
+            report.append([dict(questions[question_id], similarity=signature_similarity(signatures[root], signatures[question_id]))
+                           for question_id in sorted(members) if question_id in questions])
+        report.sort(key=lambda group: (-len(group), group[0]["id"]))
+        return report
+    
+    def search(self, query, category=None, limit=SEARCH_LIMIT):
+        terms = [term for term in query.replace('"', " ").split() if term]
+        if not terms:
+            return []
+        
+        conn = self._get_connection()
+        params = []
+        
+        if self.has_fts:
+            sql = QUESTION_SELECT_SQL.replace("FROM questions q", "FROM questions_fts f JOIN questions q ON q.id = f.rowid")
+            sql += " WHERE questions_fts MATCH ?"
+            params.append(" ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*')
+        else:
+            sql = QUESTION_SELECT_SQL + " WHERE 1"
+            for term in terms:
+                sql += " AND (q.question_text || ' ' || q.options_text || ' ' || IFNULL(q.feedback, '')) LIKE ?"
+                params.append(f"%{term}%")
+        
+        if category:
+            sql += " AND c.name = ?"
+            params.append(category)
+        
+        sql += " ORDER BY f.rank LIMIT ?" if self.has_fts else " ORDER BY q.id LIMIT ?"
+        params.append(limit)
+        
+        return self._questions_from_rows(conn, conn.execute(sql, params).fetchall())
+    
+    def schedule_questions(self, category_name, n=None, student="", clock=time.time):
+        return ScheduledQuestions(self, category_name, n, student, clock)
+    
+    def get_review_progress(self, student, category_id):
+        conn = self._get_connection()
+        result = conn.execute('''
+        SELECT last_new_question_id, seen_question_id FROM review_progress WHERE student = ? AND category_id = ?
+        ''', (student, category_id)).fetchone()
+        return tuple(result) if result else (0, 0)
+    
+    def pick_review_question(self, student, category_id, exclude=(), last_new_id=0, now=None, seen_id=0):
+        now = time.time() if now is None else now
+        exclude = set(exclude)
+        limit = len(exclude) + 1
+        conn = self._get_connection()
+        
+        for row in conn.execute(REVIEW_DUE_SQL, (student, category_id, now, limit)):
+            if row[0] not in exclude:
+                return row[0], False, seen_id
+        
+        max_id = conn.execute(CATEGORY_MAX_ID_SQL, (category_id,)).fetchone()[0] or 0
+        starts = [max(last_new_id, seen_id)] + ([seen_id] if seen_id < last_new_id else [])
+        unseen = False
+        for start in starts:
+            for row in conn.execute(REVIEW_NEW_SQL, (category_id, start, student, limit)):
+                if not unseen and start == seen_id:
+                    seen_id = row[0] - 1
+                unseen = True
+                if row[0] not in exclude:
+                    return row[0], True, seen_id
+        if not unseen:
+            seen_id = max(seen_id, max_id)
+        
+        for row in conn.execute(REVIEW_UPCOMING_SQL, (student, category_id, limit)):
+            if row[0] not in exclude:
+                return row[0], False, seen_id
+        return None, False, seen_id
+    
+    def apply_reviews(self, student, category_id, reviews, last_new_id=None, seen_id=0):
+        conn = self._get_connection()
+        with conn:
+            for question_id, is_correct, response_ms, answered_at in reviews:
+                state = conn.execute('''
+                SELECT repetitions, ease, interval_days FROM review_schedule WHERE student = ? AND question_id = ?
+                ''', (student, question_id)).fetchone()
+                conn.execute('''
+                INSERT OR REPLACE INTO review_schedule (student, question_id, category_id, repetitions, ease, interval_days, due_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (student, question_id, category_id,
+                      *schedule_review(state or SM2_INITIAL_STATE, is_correct, response_ms, answered_at)))
+            if last_new_id is not None:
+                conn.execute('''
+                INSERT OR REPLACE INTO review_progress (student, category_id, last_new_question_id, seen_question_id) VALUES (?, ?, ?, ?)
+                ''', (student, category_id, last_new_id, seen_id))
+    
+    def get_review_schedule(self, student, category_name=None):
+        conn = self._get_connection()
+        sql = '''
+        SELECT r.question_id, r.repetitions, r.ease, r.interval_days, r.due_at
+        FROM review_schedule r JOIN categories c ON c.id = r.category_id
+        WHERE r.student = ?
+        '''
+        params = [student]
+        if category_name:
+            sql += " AND c.name = ?"
+            params.append(category_name)
+        return {row[0]: {"repetitions": row[1], "ease": row[2], "interval_days": row[3], "due_at": row[4]}
+                for row in conn.execute(sql + " ORDER BY r.due_at", params)}
+    
+    def start_attempt(self, category_name, student="", started_at=None):
+        conn = self._get_connection()
+        with conn:
+            return conn.execute('''
+            INSERT INTO attempts (category_id, student, started_at)
+            VALUES ((SELECT id FROM categories WHERE name = ?), ?, ?)
+            ''', (category_name, student, time.time() if started_at is None else started_at)).lastrowid
+    
+    def record_responses(self, responses, finished_attempts=()):
+        conn = self._get_connection()
+        with conn:
+            conn.executemany('''
+            INSERT INTO responses (attempt_id, question_id, chosen_answers, is_correct, response_ms, answered_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', responses)
+            conn.executemany("UPDATE attempts SET score = ?, total = ?, finished_at = ? WHERE id = ?", finished_attempts)
+            
+            totals = {}
+            for attempt_id, question_id, chosen_answers, is_correct, response_ms, answered_at in responses:
+                total = totals.setdefault(question_id, [0, 0, 0])
+                total[0] += 1
+                total[1] += int(is_correct)
+                total[2] += response_ms
+            increments = [(*total, question_id) for question_id, total in totals.items()]
+            for statement in QUESTION_STATS_UPDATE_SQL:
+                conn.executemany(statement, increments)
+    
+    def get_question_stats(self, question_ids=None):
+        conn = self._get_connection()
+        sql = "SELECT question_id, attempts, correct, total_ms FROM question_stats WHERE attempts > 0"
+        if question_ids is None:
+            rows = conn.execute(sql)
+        else:
+            question_ids = list(question_ids)
+            rows = conn.execute(sql + f" AND question_id IN ({', '.join('?' * len(question_ids))})", question_ids)
+        return {row[0]: self._stats_from_row(row) for row in rows}
+    
+    def get_category_stats(self):
+        conn = self._get_connection()
+        rows = conn.execute('''
+        SELECT c.name, s.attempts, s.correct, s.total_ms
+        FROM category_stats s JOIN categories c ON c.id = s.category_id
+        ''')
+        return {row[0]: self._stats_from_row(row) for row in rows}
+    
+    def _stats_from_row(self, row):
+        attempts, correct, total_ms = row[1], row[2], row[3]
+        return {
+            "attempts": attempts,
+            "correct": correct,
+            "percent_correct": 100.0 * correct / attempts if attempts else None,
+            "avg_ms": total_ms / attempts if attempts else None
+        }
+    
+    def get_attempt_responses(self, attempt_id):
+        conn = self._get_connection()
+        cursor = conn.execute('''
+        SELECT question_id, chosen_answers, is_correct, response_ms, answered_at
+        FROM responses WHERE attempt_id = ? ORDER BY id
+        ''', (attempt_id,))
+        return [{"question_id": row[0], "answers": json.loads(row[1]), "correct": bool(row[2]),
+                 "response_ms": row[3], "answered_at": row[4]} for row in cursor]
+    
+    def query_plan(self, sql, params=()):
+        conn = self._get_connection()
+        return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+    
+    def find_full_scans(self):
+        full_scans = {}
+        for name, (sql, params) in {**INDEXED_QUERIES, **ORDERED_QUERIES}.items():
+            scans = [step for step in self.query_plan(sql, params)
+                     if step.startswith("SCAN") and "USING" not in step and name in INDEXED_QUERIES
+                     or step == "USE TEMP B-TREE FOR ORDER BY"]
+            if scans:
+                full_scans[name] = scans
+        return full_scans
+    
+    def import_questions(self, records, batch_size=IMPORT_BATCH_SIZE, progress=None):
+        conn = self._get_connection()
+        category_ids = dict(conn.execute("SELECT name, id FROM categories"))
+        batch = []
+        batch_options = []
+        imported = 0
+        
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            last_id = conn.execute("SELECT IFNULL(MAX(id), 0) FROM questions").fetchone()[0]
+            if self.has_fts:
+                conn.execute("DROP TRIGGER IF EXISTS questions_fts_insert")
+            conn.execute("DROP TRIGGER IF EXISTS questions_change_insert")
+            conn.execute("DROP TRIGGER IF EXISTS question_stats_insert")
+            
+            for row_number, record in enumerate(records, 1):
+                try:
+                    question = normalize_question_record(record)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    raise ValueError(f"Row {row_number}: {e}") from e
+                
+                category_id = category_ids.get(question["category"])
+                if category_id is None:
+                    category_id = conn.execute("INSERT INTO categories (name) VALUES (?)", (question["category"],)).lastrowid
+                    category_ids[question["category"]] = category_id
+                
+                options = question["options"]
+                batch.append((category_id, question["question"], *legacy_options(options), join_options(options), json.dumps(question["answers"]),
+                              encode_answers(options, question["answers"]), question["is_multiple_choice"], question["feedback"]))
+                batch_options.append(options)
+                
+                if len(batch) >= batch_size:
+                    self._insert_question_batch(conn, batch, batch_options)
+                    imported += len(batch)
+                    batch = []
+                    batch_options = []
+                    if progress:
+                        progress(imported)
+            
+            if batch:
+                self._insert_question_batch(conn, batch, batch_options)
+                imported += len(batch)
+                if progress:
+                    progress(imported)
+            
+            if self.has_fts:
+                conn.execute(FTS_BULK_INSERT_SQL, (last_id,))
+                conn.execute(FTS_INSERT_TRIGGER_SQL)
+            backfill_question_lsh(conn, last_id)
+            conn.execute("INSERT OR IGNORE INTO question_stats (question_id) SELECT id FROM questions WHERE id > ?", (last_id,))
+            conn.execute(QUESTION_STATS_TRIGGER_SQL)
+            conn.execute(change_trigger_sql("questions", "insert"))
+            conn.execute("INSERT INTO change_log (table_name, row_id) VALUES ('questions', NULL)")
+        
+        self._category_question_ids.clear()
+        self._category_counts = None
+        return imported
+    
+    def _insert_question_batch(self, conn, batch, batch_options):
+        conn.executemany(INSERT_QUESTION_SQL, batch)
+        first_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0] - len(batch) + 1
+        conn.executemany(INSERT_OPTION_SQL, [(first_id + index, position, option)
+                                             for index, options in enumerate(batch_options)
+                                             for position, option in enumerate(options)])
+
+KIOSK_FLUSH_SECONDS = 30
+
+class KioskDatabase(QuizDatabase):
+    allows_admin = False
+    tracks_changes = False
+    
+    def __init__(self, db_file="quiz_database.db", cache_size_kb=8192, flush_interval=KIOSK_FLUSH_SECONDS):
+        self.disk = QuizDatabase(db_file, cache_size_kb)
+        self.memory_uri = f"file:quiz-kiosk-{id(self)}?mode=memory&cache=shared"
+        self._memory = sqlite3.connect(self.memory_uri, uri=True, check_same_thread=False)
+        self.disk._get_connection().backup(self._memory)
+        
+        self.flush_interval = flush_interval
+        self.flushed = 0
+        self._pending_writes = collections.deque()
+        self._attempt_ids = {}
+        self._write_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        super().__init__(db_file, cache_size_kb)
+        
+        self._thread = threading.Thread(target=self._run, name="quiz-kiosk", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def _open(self):
+        conn = sqlite3.connect(self.memory_uri, uri=True, cached_statements=256, check_same_thread=False)
+        conn.execute("PRAGMA read_uncommitted = ON")
+        return conn
+    
+    def start_attempt(self, category_name, student="", started_at=None):
+        started_at = time.time() if started_at is None else started_at
+        with self._write_lock:
+            attempt_id = super().start_attempt(category_name, student, started_at)
+            self._pending_writes.append(("start_attempt", attempt_id, (category_name, student, started_at)))
+        return attempt_id
+    
+    def record_responses(self, responses, finished_attempts=()):
+        responses = list(responses)
+        finished_attempts = list(finished_attempts)
+        with self._write_lock:
+            super().record_responses(responses, finished_attempts)
+            self._pending_writes.append(("record_responses", None, (responses, finished_attempts)))
+    
+    def apply_reviews(self, student, category_id, reviews, last_new_id=None, seen_id=0):
+        reviews = list(reviews)
+        with self._write_lock:
+            super().apply_reviews(student, category_id, reviews, last_new_id, seen_id)
+            self._pending_writes.append(("apply_reviews", None, (student, category_id, reviews, last_new_id, seen_id)))
+    
+    def pending(self):
+        return len(self._pending_writes)
+    
+    def flush(self):
+        with self._flush_lock:
+            flushed = 0
+            while self._pending_writes:
+                name, local_id, args = self._pending_writes[0]
+                if name == "start_attempt":
+                    self._attempt_ids[local_id] = self.disk.start_attempt(*args)
+                elif name == "record_responses":
+                    responses, finished_attempts = args
+                    self.disk.record_responses(
+                        [(self._attempt_ids[response[0]], *response[1:]) for response in responses],
+                        [(*finished[:3], self._attempt_ids[finished[3]]) for finished in finished_attempts])
+                else:
+                    self.disk.apply_reviews(*args)
+                self._pending_writes.popleft()
+                flushed += 1
+            self.flushed += flushed
+            return flushed
+    
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except (sqlite3.Error, OSError):
+                pass
+    
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._wakeup.set()
+            self._thread.join()
+        if self._memory is None:
+            return
+        
+        self.flush()
+        atexit.unregister(self.close)
+        super().close()
+        self._memory.close()
+        self._memory = None
+        self.disk.close()
+
+SERVER_PORT = 8765
+SERVER_READERS = 4
+SERVER_TIMEOUT_SECONDS = 10
+
+SERVER_READ_METHODS = (
+    "get_categories", "get_category_counts", "get_category_id", "get_category_question_ids", "sample_question_ids",
+    "get_question_by_id", "get_review_progress", "pick_review_question", "search", "get_attachment",
+)
+
+SERVER_WRITE_METHODS = ("start_attempt", "record_responses", "apply_reviews")
+
+class RemoteQuizDatabase:
+    allows_admin = False
+    tracks_changes = False
+    
+    def __init__(self, url, timeout=SERVER_TIMEOUT_SECONDS):
+        import urllib.parse
+        parts = urllib.parse.urlsplit(url if "//" in url else "http://" + url)
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or SERVER_PORT
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+    
+    def _get_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import http.client
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            with self._lock:
+                self.connections_opened += 1
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+    
+    def call(self, name, *args, **kwargs):
+        import http.client
+        body = json.dumps({"args": args, "kwargs": kwargs}).encode("utf-8")
+        conn = self._get_connection()
+        
+        for retry in (name in SERVER_READ_METHODS, False):
+            try:
+                conn.request("POST", f"/call/{name}", body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                payload = json.loads(response.read())
+                break
+            except (ConnectionResetError, BrokenPipeError, http.client.BadStatusLine) as e:
+                conn.close()
+                if not retry:
+                    raise ConnectionError(f"Lost the connection to the quiz server during {name}: {e!r}") from e
+        
+        if response.status == 400:
+            raise ValueError(payload["error"])
+        if response.status != 200:
+            raise ConnectionError(f"Quiz server error: {payload.get('error', response.reason)}")
+        return payload["result"]
+    
+    def __getattr__(self, name):
+        if name in SERVER_READ_METHODS or name in SERVER_WRITE_METHODS:
+            return functools.partial(self.call, name)
+        raise AttributeError(name)
+    
+    def sample_questions(self, category_name, n=None, seed=None):
+        return QuestionSequence(self, self.call("sample_question_ids", category_name, n, seed))
+    
+    def get_attachment(self, attachment_id):
+        import base64
+        attachment = self.call("get_attachment", attachment_id)
+        return (attachment[0], base64.b64decode(attachment[1])) if attachment else None
+    
+    def schedule_questions(self, category_name, n=None, student="", clock=time.time):
+        return ScheduledQuestions(self, category_name, n, student, clock)
+    
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def filled_options(option_entries):
+    options = [entry.get().strip() for entry in option_entries]
+    while options and not options[-1]:
+        options.pop()
+    return options
+
+QUIZ_LENGTH_CHOICES = ("10", "20", "50", "All")
+QUIZ_MODE_CHOICES = ("Random", "Spaced Repetition")
+CATEGORY_LIST_ROWS = 8
+DB_POLL_MS = 10
+CHANGE_POLL_MS = 1000
+BUSY_DELAY_MS = 150
+
+class QuizApp:
+    def __init__(self, root, instrumentation=None, db=None):
+        load_tk()
+        self.root = root
+        self.root.title("Quiz Application")
+        self.root.geometry("800x600")
+        
+        self.db = db if db is not None else QuizDatabase()
+        self.instrumentation = instrumentation
+        if instrumentation:
+            instrumentation.instrument_database(self.db)
+            instrumentation.instrument_app(self)
+        self.db_worker = DatabaseWorker(self.db)
+        self.media_executor = concurrent.futures.ThreadPoolExecutor(max_workers=MEDIA_WORKERS, thread_name_prefix="quiz-media")
+        self.media_cache = MediaCache()
+        self.media_pending = set()
+        self.response_buffer = ResponseBuffer(self.db)
+        self.pending_calls = []
+        self.poll_scheduled = False
+        self.change_listeners = []
+        self.change_poll_job = None
+        self.admin_password = "1526"
+        self.quiz_length = "20"
+        self.quiz_mode = QUIZ_MODE_CHOICES[0]
+        self.student = ""
+        self.current_frame = None
+        self.quiz_view = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        if getattr(self.db, "tracks_changes", False):
+            self.poll_database_changes()
+        self.show_welcome_screen()
+    
+    def on_close(self):
+        if self.change_poll_job:
+            self.root.after_cancel(self.change_poll_job)
+        self.change_listeners = None
+        self.db_worker.shutdown()
+        self.media_executor.shutdown(wait=True)
+        while True:
+            try:
+                self.response_buffer.close()
+                self.db.close()
+                break
+            except (sqlite3.Error, OSError) as e:
+                if not messagebox.askretrycancel("Save Failed", f"Some answers could not be saved to the database file:\n{e}"):
+                    break
+        self.root.destroy()
+    
+    def run_in_background(self, function, *args, on_done=None, on_error=None, widget=None, show_busy=True, executor=None):
+        future = (executor or self.db_worker).submit(function, *args)
+        self.pending_calls.append((future, on_done, on_error, widget, show_busy, time.perf_counter()))
+        if not self.poll_scheduled:
+            self.poll_scheduled = True
+            self.root.after(DB_POLL_MS, self.poll_background_calls)
+        return future
+    
+    def poll_background_calls(self):
+        self.poll_scheduled = False
+        finished = []
+        pending = []
+        for call in self.pending_calls:
+            (finished if call[0].done() else pending).append(call)
+        self.pending_calls = pending
+        
+        for future, on_done, on_error, widget, show_busy, started in finished:
+            if widget is not None and not widget.winfo_exists():
+                continue
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+                else:
+                    messagebox.showerror("Database Error", str(error))
+            elif on_done:
+                on_done(future.result())
+        
+        now = time.perf_counter()
+        busy = any(show_busy and (now - started) * 1000 >= BUSY_DELAY_MS
+                   for future, on_done, on_error, widget, show_busy, started in self.pending_calls)
+        self.root.config(cursor="watch" if busy else "")
+        
+        if self.pending_calls and not self.poll_scheduled:
+            self.poll_scheduled = True
+            self.root.after(DB_POLL_MS, self.poll_background_calls)
+    
+    def poll_database_changes(self):
+        self.change_poll_job = None
+        
+        def changes_polled(changes):
+            if self.change_listeners is None:
+                return
+            if changes:
+                self.change_listeners = [(widget, callback) for widget, callback in self.change_listeners if widget.winfo_exists()]
+                for widget, callback in self.change_listeners:
+                    callback(changes)
+            self.change_poll_job = self.root.after(CHANGE_POLL_MS, self.poll_database_changes)
+        
+        self.run_in_background(self.db.poll_changes, on_done=changes_polled, on_error=lambda error: changes_polled(None),
+                               show_busy=False)
+    
+    def on_database_change(self, widget, callback):
+        if self.change_listeners is not None:
+            self.change_listeners.append((widget, callback))
+    
+    def clear_current_frame(self):
+        if self.current_frame:
+            self.current_frame.destroy()
+        self.current_frame = tk.Frame(self.root, padx=20, pady=20)
+        self.current_frame.pack(fill=tk.BOTH, expand=True)
+        return self.current_frame
+    
+    def show_welcome_screen(self):
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="Welcome to Quiz App", font=("Arial", 24, "bold")).pack(pady=20)
+        
+        tk.Button(frame, text="Take a Quiz", font=("Arial", 16), 
+                  command=self.show_category_selection, padx=20, pady=10).pack(pady=10)
+        
+        tk.Button(frame, text="Admin Login", font=("Arial", 16), 
+                  command=self.admin_login, padx=20, pady=10).pack(pady=10)
+    
+    def admin_login(self):
+        if not getattr(self.db, "allows_admin", False):
+            messagebox.showinfo("Not Available", "Admin functions are only available when the app opens the question database file directly.")
+            return
+        
+        password = simpledialog.askstring("Admin Login", "Enter admin password:", show='*')
+        if password == self.admin_password:
+            self.show_admin_panel()
+        else:
+            messagebox.showerror("Access Denied", "Incorrect password")
+    
+    def show_category_selection(self):
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="Select Quiz Category", font=("Arial", 20, "bold")).pack(pady=20)
+        
+        categories_frame = tk.Frame(frame)
+        categories_frame.pack()
+        loading_label = tk.Label(categories_frame, text="Loading categories...", font=("Arial", 14))
+        loading_label.pack(pady=20)
+        
+        tk.Button(frame, text="Back", command=self.show_welcome_screen).pack(pady=20)
+        
+        def show_categories(categories):
+            loading_label.destroy()
+            
+            if not categories:
+                tk.Label(categories_frame, text="No quiz categories available.", font=("Arial", 14)).pack(pady=20)
+                self.on_database_change(frame, lambda changes: self.show_category_selection())
+                return
+            
+            length_frame = tk.Frame(categories_frame)
+            length_frame.pack(pady=5)
+            
+            tk.Label(length_frame, text="Questions per quiz:", font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+            length_var = tk.StringVar(value=self.quiz_length)
+            length_combo = ttk.Combobox(length_frame, textvariable=length_var, font=("Arial", 12),
+                                        values=QUIZ_LENGTH_CHOICES, state="readonly", width=8)
+            length_combo.pack(side=tk.LEFT)
+            length_combo.bind("<<ComboboxSelected>>", lambda event: setattr(self, "quiz_length", length_var.get()))
+            
+            mode_frame = tk.Frame(categories_frame)
+            mode_frame.pack(pady=5)
+            
+            tk.Label(mode_frame, text="Mode:", font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+            mode_var = tk.StringVar(value=self.quiz_mode)
+            mode_combo = ttk.Combobox(mode_frame, textvariable=mode_var, font=("Arial", 12),
+                                      values=QUIZ_MODE_CHOICES, state="readonly", width=16)
+            mode_combo.pack(side=tk.LEFT)
+            mode_combo.bind("<<ComboboxSelected>>", lambda event: setattr(self, "quiz_mode", mode_var.get()))
+            
+            tk.Label(mode_frame, text="Student:", font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+            student_var = tk.StringVar(value=self.student)
+            tk.Entry(mode_frame, textvariable=student_var, font=("Arial", 12), width=15).pack(side=tk.LEFT)
+            student_var.trace_add("write", lambda *args: setattr(self, "student", student_var.get().strip()))
+            
+            filter_frame = tk.Frame(categories_frame)
+            filter_frame.pack(pady=5)
+            
+            tk.Label(filter_frame, text="Filter:", font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+            filter_var = tk.StringVar()
+            filter_entry = tk.Entry(filter_frame, textvariable=filter_var, font=("Arial", 12), width=30)
+            filter_entry.pack(side=tk.LEFT)
+            
+            list_frame = tk.Frame(categories_frame)
+            list_frame.pack(pady=5)
+            
+            scrollbar = ttk.Scrollbar(list_frame)
+            scrollbar.grid(row=0, column=1, rowspan=CATEGORY_LIST_ROWS, sticky=tk.N+tk.S)
+            
+            empty_label = tk.Label(list_frame, text="No matching categories.", font=("Arial", 12))
+            view = {"categories": categories, "rows": categories, "offset": 0}
+            
+            def render():
+                rows = view["rows"]
+                offset = view["offset"]
+                for index, button in enumerate(row_buttons):
+                    if offset + index >= len(rows):
+                        button.grid_remove()
+                        continue
+                    category, count = rows[offset + index]
+                    button.config(text=f"{category} ({count} question{'s' if count != 1 else ''})",
+                                  command=lambda c=category: self.start_quiz(c),
+                                  state=tk.NORMAL if count else tk.DISABLED)
+                    button.grid()
+                
+                if rows:
+                    empty_label.grid_remove()
+                    scrollbar.set(offset / len(rows), min(1, (offset + CATEGORY_LIST_ROWS) / len(rows)))
+                else:
+                    empty_label.grid(row=0, column=0)
+                    scrollbar.set(0, 1)
+            
+            def scroll_to(offset):
+                view["offset"] = max(0, min(offset, len(view["rows"]) - CATEGORY_LIST_ROWS))
+                render()
+            
+            def on_scrollbar(action, amount, unit=None):
+                if action == "moveto":
+                    scroll_to(round(float(amount) * len(view["rows"])))
+                else:
+                    scroll_to(view["offset"] + int(amount) * (CATEGORY_LIST_ROWS if unit == "pages" else 1))
+            
+            def on_mouse_wheel(event):
+                scroll_to(view["offset"] + (-1 if event.num == 4 or event.delta > 0 else 1))
+            
+            def filter_rows():
+                text = filter_var.get().strip().lower()
+                categories = view["categories"]
+                view["rows"] = [row for row in categories if text in row[0].lower()] if text else categories
+            
+            def apply_filter(*args):
+                filter_rows()
+                scroll_to(0)
+            
+            def counts_changed(categories):
+                view["categories"] = categories
+                filter_rows()
+                scroll_to(view["offset"])
+            
+            self.on_database_change(frame, lambda changes: self.run_in_background(
+                self.db.get_category_counts, on_done=counts_changed, widget=frame, show_busy=False))
+            
+            row_buttons = []
+            for index in range(CATEGORY_LIST_ROWS):
+                button = tk.Button(list_frame, font=("Arial", 14), padx=20, pady=5, width=30)
+                button.grid(row=index, column=0, pady=3)
+                row_buttons.append(button)
+            
+            for widget in [list_frame, *row_buttons]:
+                widget.bind("<MouseWheel>", on_mouse_wheel)
+                widget.bind("<Button-4>", on_mouse_wheel)
+                widget.bind("<Button-5>", on_mouse_wheel)
+            
+            scrollbar.config(command=on_scrollbar)
+            filter_var.trace_add("write", apply_filter)
+            filter_entry.focus_set()
+            render()
+        
+        self.run_in_background(self.db.get_category_counts, on_done=show_categories, widget=frame)
+    
+    def start_quiz(self, category):
+        quiz_length = None if self.quiz_length == "All" else int(self.quiz_length)
+        scheduled = self.quiz_mode == "Spaced Repetition"
+        student = self.student
+        
+        def prepare_quiz():
+            if scheduled:
+                quiz_questions = self.db.schedule_questions(category, quiz_length, student)
+            else:
+                quiz_questions = self.db.sample_questions(category, quiz_length)
+            attempt_id = self.db.start_attempt(category, student) if quiz_questions else None
+            return quiz_questions, attempt_id
+        
+        self.run_in_background(prepare_quiz, on_done=lambda result: self.begin_quiz(category, *result),
+                               widget=self.current_frame)
+    
+    def begin_quiz(self, category, quiz_questions, attempt_id=None):
+        if not quiz_questions:
+            messagebox.showinfo("No Questions", f"No questions available for {category}.")
+            self.show_category_selection()
+            return
+        
+        scheduler = quiz_questions if isinstance(quiz_questions, ScheduledQuestions) else None
+        self.quiz_session = QuizSession(quiz_questions, self.response_buffer, attempt_id, scheduler)
+        self.show_quiz_question()
+    
+    def show_quiz_question(self):
+        session = self.quiz_session
+        questions = session.questions
+        
+        if not questions.is_loaded(session.current):
+            self.run_in_background(questions.load, session.current,
+                                   on_done=lambda question: self.show_quiz_question())
+            return
+        
+        if self.quiz_view is None or not self.quiz_view.exists() or self.quiz_view.frame is not self.current_frame:
+            self.quiz_view = QuizView(self.clear_current_frame(), self.check_answer)
+        
+        progress_text = f"Question {session.current + 1} of {session.total} | Score: {session.score}"
+        question = session.next_question()
+        self.quiz_view.show(question, progress_text)
+        self.show_media(self.media_keys(question))
+        
+        following = session.current + 1
+        if following < session.total:
+            if questions.is_loaded(following):
+                self.prefetch_media(questions[following])
+            else:
+                self.run_in_background(questions.load, following, on_done=self.prefetch_media,
+                                       on_error=lambda error: None, show_busy=False)
+    
+    def media_keys(self, question):
+        return [(attachment_id, MEDIA_MAX_WIDTH // len(question.attachments), MEDIA_MAX_HEIGHT)
+                for attachment_id in question.attachments]
+    
+    def show_media(self, keys):
+        images = []
+        for key in keys:
+            image = self.media_cache.get(key)
+            if image is None:
+                image = "Loading image..."
+                self.load_media(key)
+            images.append(image)
+        self.quiz_view.show_media(keys, images)
+    
+    def prefetch_media(self, question):
+        for key in self.media_keys(question):
+            self.load_media(key)
+    
+    def load_media(self, key):
+        if key in self.media_cache or key in self.media_pending:
+            return
+        self.media_pending.add(key)
+        
+        def refresh():
+            self.media_pending.discard(key)
+            if self.quiz_view is not None and self.quiz_view.exists() and key in self.quiz_view.media_keys:
+                self.show_media(self.quiz_view.media_keys)
+        
+        def media_failed(error):
+            message = f"Image unavailable: {error}"
+            self.media_cache.put(key, message, sys.getsizeof(message))
+            refresh()
+        
+        def media_decoded(decoded):
+            try:
+                self.media_cache.put(key, *photo_image(decoded))
+            except tk.TclError as e:
+                media_failed(e)
+                return
+            refresh()
+        
+        self.run_in_background(decode_attachment, self.db, *key, on_done=media_decoded, on_error=media_failed,
+                               show_busy=False, executor=self.media_executor)
+    
+    def check_answer(self):
+        question = self.quiz_session.next_question()
+        user_answers = question.get_user_answers()
+        is_correct = self.quiz_session.submit(user_answers)
+        
+        if is_correct is None:
+            messagebox.showinfo("Selection Required", 
+                               "Please select at least one answer." if question.is_multiple_choice 
+                               else "Please select an answer.")
+            return
+        
+        if is_correct:
+            messagebox.showinfo("Correct!", "Your answer is correct!")
+        else:
+            formatted_answers = "\n".join(question.correct_answers)
+            feedback_message = f"The correct answer(s):\n{formatted_answers}"
+            
+            if question.feedback:
+                feedback_message += f"\n\nExplanation:\n{question.feedback}"
+                
+            messagebox.showinfo("Incorrect", feedback_message)
+        
+        if self.quiz_session.finished:
+            self.show_quiz_results()
+        else:
+            self.show_quiz_question()
+    
+    def show_quiz_results(self):
+        frame = self.clear_current_frame()
+        self.run_in_background(self.response_buffer.flush, show_busy=False)
+        
+        session = self.quiz_session
+        if session.scheduler:
+            self.run_in_background(session.scheduler.flush, show_busy=False)
+        result_text = f"Quiz Completed!\nYour Score: {session.score}/{session.total}"
+        tk.Label(frame, text=result_text, font=("Arial", 20)).pack(pady=30)
+        
+        tk.Label(frame, text=f"{session.percentage:.1f}%", font=("Arial", 24, "bold")).pack(pady=10)
+        
+        tk.Button(frame, text="Try Another Quiz", font=("Arial", 14),
+                  command=self.show_category_selection, padx=10, pady=5).pack(pady=10)
+        
+        tk.Button(frame, text="Main Menu", font=("Arial", 14),
+                  command=self.show_welcome_screen, padx=10, pady=5).pack(pady=10)
+    
+    def show_admin_panel(self):
+        frame = self.clear_current_frame()
+        frame.bind("<Destroy>", lambda event: self.root.unbind("<Control-Shift-D>") if event.widget is frame else None)
+        self.root.bind("<Control-Shift-D>", lambda event: self.show_diagnostics())
+        
+        tk.Label(frame, text="Admin Panel", font=("Arial", 20, "bold")).pack(pady=20)
+        
+        tk.Button(frame, text="Add New Question", font=("Arial", 14),
+                  command=self.show_add_question_form, padx=10, pady=5, width=20).pack(pady=10)
+        
+        tk.Button(frame, text="View/Edit Questions", font=("Arial", 14),
+                  command=self.show_view_questions, padx=10, pady=5, width=20).pack(pady=10)
+        
+        tk.Button(frame, text="Add Category", font=("Arial", 14),
+                  command=self.show_add_category_form, padx=10, pady=5, width=20).pack(pady=10)
+        
+        tk.Button(frame, text="Import File", font=("Arial", 14),
+                  command=self.import_question_file, padx=10, pady=5, width=20).pack(pady=10)
+        
+        tk.Button(frame, text="Export File", font=("Arial", 14),
+                  command=self.export_question_file, padx=10, pady=5, width=20).pack(pady=10)
+        
+        tk.Button(frame, text="Duplicate Report", font=("Arial", 14),
+                  command=self.show_duplicate_report, padx=10, pady=5, width=20).pack(pady=10)
+        
+        tk.Button(frame, text="Logout", font=("Arial", 14),
+                  command=self.show_welcome_screen, padx=10, pady=5).pack(pady=20)
+    
+    def show_diagnostics(self):
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="Diagnostics", font=("Arial", 18, "bold")).pack(pady=10)
+        
+        if not self.instrumentation:
+            tk.Label(frame, text="Instrumentation is off. Start the app with --instrument or set QUIZ_INSTRUMENT=1.",
+                     font=("Arial", 12), wraplength=700).pack(pady=20)
+            tk.Button(frame, text="Back to Admin Panel", font=("Arial", 12),
+                      command=self.show_admin_panel, padx=10, pady=5).pack(pady=10)
+            return
+        
+        summary_label = tk.Label(frame, font=("Arial", 12))
+        summary_label.pack(pady=5)
+        
+        columns = ("Kind", "Name", "Count", "Mean ms", "Max ms", "Histogram")
+        tree = ttk.Treeview(frame, columns=columns, show="headings", height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+        tree.column("Kind", width=60)
+        tree.column("Name", width=200)
+        tree.column("Count", width=60)
+        tree.column("Mean ms", width=80)
+        tree.column("Max ms", width=80)
+        tree.column("Histogram", width=260)
+        tree.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        profile_text = tk.Text(frame, font=("Courier", 9), height=8)
+        profile_text.pack(fill=tk.X, pady=5)
+        
+        def refresh():
+            snapshot = self.instrumentation.snapshot(self.db)
+            summary_label.config(text=f"SQL statements: {snapshot['statement_count']} | "
+                                      f"Connections opened: {snapshot['connections_opened']} | "
+                                      f"Profiles saved: {len(snapshot['profiles'])}")
+            tree.delete(*tree.get_children())
+            bounds = [f"<={bound}" for bound in HISTOGRAM_BUCKETS_MS] + [">"]
+            for row in snapshot["timings"]:
+                histogram = " ".join(f"{bound}:{count}" for bound, count in zip(bounds, row["buckets"]) if count)
+                tree.insert("", tk.END, values=(row["kind"], row["name"], row["count"], f"{row['mean_ms']:.2f}",
+                                                f"{row['max_ms']:.2f}", histogram))
+            
+            profile_text.delete("1.0", tk.END)
+            if self.instrumentation.profiles:
+                latest = self.instrumentation.profiles[-1]
+                profile_text.insert("1.0", f"{latest['screen']} ({latest['path']})\n{latest['summary']}")
+        
+        def save(extension):
+            path = filedialog.asksaveasfilename(defaultextension=extension,
+                                                filetypes=[(extension.upper()[1:] + " files", "*" + extension)])
+            if path:
+                self.instrumentation.dump(path, self.db)
+                messagebox.showinfo("Success", f"Diagnostics saved to {path}")
+        
+        def reset():
+            self.instrumentation.reset()
+            refresh()
+        
+        profile_frame = tk.Frame(frame)
+        profile_frame.pack(fill=tk.X, pady=5)
+        
+        tk.Label(profile_frame, text="Profile next:", font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+        screens = sorted(INSTRUMENTED_SCREENS)
+        screen_var = tk.StringVar(value=self.instrumentation.profile_screen or screens[0])
+        ttk.Combobox(profile_frame, textvariable=screen_var, values=screens, state="readonly",
+                     width=30).pack(side=tk.LEFT, padx=5)
+        
+        def profile_next():
+            self.instrumentation.profile_screen = screen_var.get()
+            messagebox.showinfo("Profiling", f"The next {screen_var.get()} call will be profiled with cProfile.")
+        
+        tk.Button(profile_frame, text="Arm Profiler", command=profile_next).pack(side=tk.LEFT, padx=5)
+        
+        button_frame = tk.Frame(frame)
+        button_frame.pack(fill=tk.X, pady=5)
+        
+        tk.Button(button_frame, text="Refresh", font=("Arial", 12), command=refresh).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Save JSON", font=("Arial", 12), command=lambda: save(".json")).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Save CSV", font=("Arial", 12), command=lambda: save(".csv")).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Reset", font=("Arial", 12), command=reset).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 12),
+                  command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.RIGHT, padx=5)
+        
+        refresh()
+    
+    def import_question_file(self):
+        path = filedialog.askopenfilename(title="Import Questions",
+                                          filetypes=[("Question files", f"*.csv *.json *.jsonl *{BUNDLE_EXTENSION}"), ("All files", "*.*")])
+        if not path:
+            return
+        
+        frame = self.clear_current_frame()
+        tk.Label(frame, text="Importing Questions", font=("Arial", 18, "bold")).pack(pady=20)
+        progress_label = tk.Label(frame, text="0 questions imported", font=("Arial", 14))
+        progress_label.pack(pady=10)
+        
+        progress = {"count": 0}
+        
+        def import_file():
+            return self.db.import_questions(read_question_file(path), progress=lambda count: progress.update(count=count))
+        
+        def show_progress():
+            if progress_label.winfo_exists():
+                progress_label.config(text=f"{progress['count']} questions imported")
+                if not future.done():
+                    self.root.after(100, show_progress)
+        
+        def import_done(imported):
+            messagebox.showinfo("Success", f"{imported} questions imported successfully!")
+            self.show_admin_panel()
+        
+        def import_failed(error):
+            messagebox.showerror("Import Failed", f"No questions were imported.\n\n{error}")
+            self.show_admin_panel()
+        
+        future = self.run_in_background(import_file, on_done=import_done, on_error=import_failed)
+        show_progress()
+    
+    def export_question_file(self):
+        path = filedialog.asksaveasfilename(title="Export Questions", defaultextension=".jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv"),
+                                                       ("Question bundle", f"*{BUNDLE_EXTENSION}")])
+        if not path:
+            return
+        
+        frame = self.clear_current_frame()
+        tk.Label(frame, text="Exporting Questions", font=("Arial", 18, "bold")).pack(pady=20)
+        progress_label = tk.Label(frame, text="0 questions exported", font=("Arial", 14))
+        progress_label.pack(pady=10)
+        
+        progress = {"count": 0}
+        
+        def export_file():
+            return export_questions(self.db, path, progress=lambda count: progress.update(count=count))
+        
+        def show_progress():
+            if progress_label.winfo_exists():
+                progress_label.config(text=f"{progress['count']} questions exported")
+                if not future.done():
+                    self.root.after(100, show_progress)
+        
+        def export_done(exported):
+            messagebox.showinfo("Success", f"{exported} questions exported to {path}")
+            self.show_admin_panel()
+        
+        def export_failed(error):
+            messagebox.showerror("Export Failed", f"The questions could not be exported.\n\n{error}")
+            self.show_admin_panel()
+        
+        future = self.run_in_background(export_file, on_done=export_done, on_error=export_failed)
+        show_progress()
+    
+    def show_duplicate_report(self):
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="Duplicate Report", font=("Arial", 18, "bold")).pack(pady=10)
+        status_label = tk.Label(frame, text="Looking for near-duplicate questions...", font=("Arial", 12))
+        status_label.pack(pady=5)
+        
+        tree_frame = tk.Frame(frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        scrollbar = ttk.Scrollbar(tree_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        columns = ("Group", "ID", "Category", "Similarity", "Question")
+        tree = ttk.Treeview(tree_frame, columns=columns, show="headings", yscrollcommand=scrollbar.set)
+        for col in columns:
+            tree.heading(col, text=col)
+        tree.column("Group", width=60)
+        tree.column("ID", width=60)
+        tree.column("Category", width=120)
+        tree.column("Similarity", width=80)
+        tree.column("Question", width=400)
+        tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=tree.yview)
+        
+        report = []
+        
+        def show_report(groups):
+            report.extend(groups)
+            status_label.config(text=f"{len(groups)} groups of near-duplicate questions "
+                                     f"({sum(len(group) for group in groups)} questions)")
+            for group_number, group in enumerate(groups, 1):
+                for q in group:
+                    tree.insert("", tk.END, iid=str(q["id"]),
+                                values=(group_number, q["id"], q["category"], f"{q['similarity']:.0%}", q["question"]))
+        
+        self.run_in_background(self.db.find_duplicate_questions, on_done=show_report, widget=tree)
+        
+        def edit_question():
+            selected_item = tree.selection()
+            if not selected_item:
+                messagebox.showinfo("Selection Required", "Please select a question to edit.")
+                return
+            self.show_edit_question_form(tree.item(selected_item, "values")[1], on_saved=refresh_row)
+        
+        def refresh_row(q):
+            if tree.exists(str(q["id"])):
+                tree.item(str(q["id"]), values=(*tree.item(str(q["id"]), "values")[:4], q["question"]))
+        
+        def save():
+            path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+            if path:
+                with open(path, "w", newline="", encoding="utf-8") as f:
+                    write_duplicate_report(report, f)
+                messagebox.showinfo("Success", f"Duplicate report saved to {path}")
+        
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=10, fill=tk.X)
+        
+        tk.Button(button_frame, text="Edit Selected", font=("Arial", 12), command=edit_question).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Save CSV", font=("Arial", 12), command=save).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 12),
+                  command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.RIGHT, padx=5)
+    
+    def show_add_category_form(self):
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="Add New Category", font=("Arial", 18, "bold")).pack(pady=20)
+        
+        form_frame = tk.Frame(frame)
+        form_frame.pack(pady=10, fill=tk.X)
+        
+        tk.Label(form_frame, text="Category Name:", font=("Arial", 14)).grid(row=0, column=0, sticky=tk.W, pady=10)
+        category_entry = tk.Entry(form_frame, font=("Arial", 14), width=30)
+        category_entry.grid(row=0, column=1, pady=10, padx=5)
+        
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=20)
+        
+        def add_category():
+            category_name = category_entry.get().strip()
+            if not category_name:
+                messagebox.showerror("Error", "Category name cannot be empty.")
+                return
+            
+            def category_added(success):
+                if success:
+                    messagebox.showinfo("Success", f"Category '{category_name}' added successfully.")
+                    category_entry.delete(0, tk.END)
+                else:
+                    messagebox.showerror("Error", f"Category '{category_name}' already exists.")
+            
+            self.run_in_background(self.db.add_category, category_name, on_done=category_added, widget=frame)
+        
+        tk.Button(button_frame, text="Add Category", font=("Arial", 14),
+                  command=add_category, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 14),
+                  command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+    
+    def show_add_question_form(self):
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="Add New Question", font=("Arial", 18, "bold")).pack(pady=20)
+        
+        form_frame = tk.Frame(frame)
+        form_frame.pack(pady=10, fill=tk.X)
+        
+        tk.Label(form_frame, text="Category:", font=("Arial", 14)).grid(row=0, column=0, sticky=tk.W, pady=10)
+        
+        category_var = tk.StringVar()
+        category_combo = ttk.Combobox(form_frame, textvariable=category_var, font=("Arial", 14), state="readonly")
+        category_combo.grid(row=0, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
+        
+        def show_categories(categories):
+            category_combo['values'] = categories
+            if categories and not category_var.get():
+                category_var.set(categories[0])
+        
+        self.run_in_background(self.db.get_categories, on_done=show_categories, widget=frame)
+        
+        tk.Label(form_frame, text="Question:", font=("Arial", 14)).grid(row=1, column=0, sticky=tk.W, pady=10)
+        question_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
+        question_entry.grid(row=1, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
+        
+        multiple_choice_var = tk.BooleanVar()
+        tk.Checkbutton(form_frame, text="Multiple Correct Answers", font=("Arial", 14),
+                      variable=multiple_choice_var).grid(row=2, column=1, sticky=tk.W, pady=5)
+        
+        option_entries = []
+        option_vars = []
+        
+        for i in range(4):
+            tk.Label(form_frame, text=f"Option {chr(65+i)}:", font=("Arial", 14)).grid(row=3+i, column=0, sticky=tk.W, pady=5)
+            option_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
+            option_entry.grid(row=3+i, column=1, pady=5, padx=5, sticky=tk.W+tk.E)
+            option_entries.append(option_entry)
+            
+            var = tk.BooleanVar()
+            option_vars.append(var)
+            tk.Checkbutton(form_frame, text="Correct", variable=var).grid(row=3+i, column=2, padx=5)
+        
+        tk.Label(form_frame, text="Feedback:", font=("Arial", 14)).grid(row=7, column=0, sticky=tk.W, pady=10)
+        feedback_text = tk.Text(form_frame, font=("Arial", 12), width=40, height=5)
+        feedback_text.grid(row=7, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
+        tk.Label(form_frame, text="(Shown when answer is incorrect)", font=("Arial", 10, "italic")).grid(row=8, column=1, sticky=tk.W, pady=0)
+        
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=20)
+        
+        def add_question():
+            category = category_var.get()
+            question_text = question_entry.get().strip()
+            options = filled_options(option_entries)
+            is_multiple_choice = multiple_choice_var.get()
+            feedback = feedback_text.get("1.0", tk.END).strip()
+            
+            if not category or not question_text or len(options) < MIN_OPTIONS or "" in options:
+                messagebox.showerror("Error", "All fields must be filled (at least options A and B, leave unused options at the end empty).")
+                return
+            
+            correct_answers = []
+            for i, var in enumerate(option_vars[:len(options)]):
+                if var.get():
+                    correct_answers.append(options[i])
+            
+            if not correct_answers:
+                messagebox.showerror("Error", "Please select at least one correct answer.")
+                return
+            
+            if not is_multiple_choice and len(correct_answers) > 1:
+                messagebox.showerror("Error", "Single choice questions can only have one correct answer.")
+                return
+            
+            def question_added(result):
+                messagebox.showinfo("Success", "Question added successfully!")
+                
+                question_entry.delete(0, tk.END)
+                multiple_choice_var.set(False)
+                for entry in option_entries:
+                    entry.delete(0, tk.END)
+                for var in option_vars:
+                    var.set(False)
+                feedback_text.delete("1.0", tk.END)
+            
+            def confirm_duplicates(similar):
+                if similar:
+                    matches = "\n".join(f"#{q['id']} ({q['category']}, {q['similarity']:.0%} similar): {q['question']}" for q in similar)
+                    if not messagebox.askyesno("Possible Duplicate", f"This question looks like:\n\n{matches}\n\nAdd it anyway?"):
+                        return
+                self.run_in_background(self.db.add_question, category, question_text, options, correct_answers,
+                                       is_multiple_choice, feedback, on_done=question_added, widget=frame)
+            
+            self.run_in_background(self.db.find_similar_questions, question_text, options, on_done=confirm_duplicates, widget=frame)
+        
+        tk.Button(button_frame, text="Add Question", font=("Arial", 14),
+                 command=add_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 14),
+                 command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+    
+    def show_view_questions(self):
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="View/Edit Questions", font=("Arial", 18, "bold")).pack(pady=10)
+        
+        search_frame = tk.Frame(frame)
+        search_frame.pack(fill=tk.X)
+        
+        tk.Label(search_frame, text="Search:", font=("Arial", 12)).pack(side=tk.LEFT, padx=5)
+        search_entry = tk.Entry(search_frame, font=("Arial", 12))
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        tree_frame = tk.Frame(frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        scrollbar = ttk.Scrollbar(tree_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        columns = ("ID", "Category", "Question", "Type", "Correct Answers", "Has Feedback", "Attempts", "% Correct", "Avg Time")
+        sort_columns = {"ID": "id", "Category": "category", "Question": "question", "Type": "is_multiple_choice",
+                        "Attempts": "attempts", "% Correct": "percent_correct", "Avg Time": "avg_ms"}
+        page = {"order_by": "category", "descending": False, "last": None, "done": False, "loading": False,
+                "search_job": None, "generation": 0, "search": False, "keys": {}}
+        
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) > 0.9 and not page["done"] and not page["loading"]:
+                page["loading"] = True
+                self.root.after_idle(load_next_page)
+        
+        tree = ttk.Treeview(tree_frame, columns=columns, show="headings", yscrollcommand=on_scroll)
+        
+        def sort_key(q):
+            return q[page["order_by"]], q["id"]
+        
+        def load_next_page():
+            page["loading"] = True
+            page["generation"] += 1
+            generation = page["generation"]
+            last = page["last"]
+            
+            if last is None:
+                args = (None, QUESTION_PAGE_SIZE, page["order_by"], page["descending"])
+            else:
+                args = (last["id"], QUESTION_PAGE_SIZE, page["order_by"], page["descending"], last[page["order_by"]])
+            
+            def show_page(rows):
+                if generation != page["generation"]:
+                    return
+                
+                for q in rows:
+                    if not tree.exists(str(q["id"])):
+                        tree.insert("", tk.END, iid=str(q["id"]), values=self.question_tree_values(q))
+                        page["keys"][str(q["id"])] = sort_key(q)
+                
+                if rows:
+                    page["last"] = rows[-1]
+                page["done"] = len(rows) < QUESTION_PAGE_SIZE
+                page["loading"] = False
+            
+            self.run_in_background(self.db.get_questions_page, *args, on_done=show_page, widget=tree)
+        
+        def reload_pages():
+            page["last"] = None
+            page["done"] = False
+            page["search"] = False
+            page["keys"] = {}
+            tree.delete(*tree.get_children())
+            load_next_page()
+        
+        def sort_by(col):
+            order_by = sort_columns[col]
+            page["descending"] = not page["descending"] if page["order_by"] == order_by else False
+            page["order_by"] = order_by
+            search_entry.delete(0, tk.END)
+            reload_pages()
+        
+        def run_search():
+            page["search_job"] = None
+            if not tree.winfo_exists():
+                return
+            query = search_entry.get().strip()
+            if not query:
+                reload_pages()
+                return
+            
+            page["done"] = True
+            page["search"] = True
+            page["generation"] += 1
+            generation = page["generation"]
+            
+            def show_results(rows):
+                if generation != page["generation"]:
+                    return
+                tree.delete(*tree.get_children())
+                for q in rows:
+                    tree.insert("", tk.END, iid=str(q["id"]), values=self.question_tree_values(q))
+            
+            self.run_in_background(self.db.search, query, on_done=show_results, widget=tree)
+        
+        def schedule_search(event=None):
+            if page["search_job"]:
+                self.root.after_cancel(page["search_job"])
+            page["search_job"] = self.root.after(SEARCH_DEBOUNCE_MS, run_search)
+        
+        search_entry.bind("<KeyRelease>", schedule_search)
+        
+        def is_loaded(key):
+            if page["done"]:
+                return True
+            if page["last"] is None:
+                return False
+            last_key = sort_key(page["last"])
+            return key >= last_key if page["descending"] else key <= last_key
+        
+        def insert_sorted(q):
+            key = sort_key(q)
+            keys = [page["keys"][iid] for iid in tree.get_children()]
+            if page["descending"]:
+                index = len(keys) - bisect.bisect_left(keys[::-1], key)
+            else:
+                index = bisect.bisect_right(keys, key)
+            tree.insert("", index, iid=str(q["id"]), values=self.question_tree_values(q))
+            page["keys"][str(q["id"])] = key
+        
+        def update_rows(question_ids, rows):
+            questions = {q["id"]: q for q in rows}
+            for question_id in question_ids:
+                iid = str(question_id)
+                q = questions.get(question_id)
+                selected = False
+                if tree.exists(iid):
+                    if q and (page["search"] or page["keys"].get(iid) == sort_key(q)):
+                        tree.item(iid, values=self.question_tree_values(q))
+                        continue
+                    selected = iid in tree.selection()
+                    tree.delete(iid)
+                    page["keys"].pop(iid, None)
+                
+                if q and not page["search"] and is_loaded(sort_key(q)):
+                    insert_sorted(q)
+                    if selected:
+                        tree.selection_add(iid)
+        
+        def questions_changed(changes):
+            if None in (changes.get("questions", ()), changes.get("categories", ())):
+                run_search()
+            elif changes.get("questions"):
+                question_ids = changes["questions"]
+                self.run_in_background(self.db.get_questions_by_ids, question_ids,
+                                       on_done=lambda rows: update_rows(question_ids, rows), widget=tree, show_busy=False)
+        
+        self.on_database_change(tree, questions_changed)
+        
+        for col in columns:
+            if col in sort_columns:
+                tree.heading(col, text=col, command=lambda c=col: sort_by(c))
+            else:
+                tree.heading(col, text=col)
+        
+        tree.column("ID", width=50)
+        tree.column("Category", width=100)
+        tree.column("Question", width=220)
+        tree.column("Type", width=100)
+        tree.column("Correct Answers", width=120)
+        tree.column("Has Feedback", width=90)
+        tree.column("Attempts", width=70)
+        tree.column("% Correct", width=70)
+        tree.column("Avg Time", width=70)
+        
+        tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=tree.yview)
+        
+        load_next_page()
+        
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=10, fill=tk.X)
+        
+        def edit_question():
+            selected_item = tree.selection()
+            if not selected_item:
+                messagebox.showinfo("Selection Required", "Please select a question to edit.")
+                return
+            
+            item_id = tree.item(selected_item, "values")[0]
+            self.show_edit_question_form(item_id, on_saved=refresh_row)
+        
+        def refresh_row(q):
+            if tree.exists(str(q["id"])):
+                tree.item(str(q["id"]), values=self.question_tree_values(q))
+        
+        tk.Button(button_frame, text="Edit Selected", font=("Arial", 12),
+                  command=edit_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+        
+        def delete_question():
+            selected_item = tree.selection()
+            if not selected_item:
+                messagebox.showinfo("Selection Required", "Please select a question to delete.")
+                return
+            
+            item_id = tree.item(selected_item, "values")[0]
+            if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this question?"):
+                def question_deleted(result):
+                    if tree.exists(str(item_id)):
+                        tree.delete(str(item_id))
+                        page["keys"].pop(str(item_id), None)
+                    messagebox.showinfo("Success", "Question deleted successfully!")
+                
+                self.run_in_background(self.db.delete_question, item_id, on_done=question_deleted, widget=tree)
+        
+        tk.Button(button_frame, text="Delete Selected", font=("Arial", 12),
+                  command=delete_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(button_frame, text="Back to Admin Panel", font=("Arial", 12),
+                  command=self.show_admin_panel, padx=10, pady=5).pack(side=tk.RIGHT, padx=5)
+    
+    def question_tree_values(self, q):
+        question_type = "Multiple Choice" if q["is_multiple_choice"] else "Single Choice"
+        answers_text = ", ".join(q["answers"])
+        has_feedback = "Yes" if q["feedback"] else "No"
+        if q.get("attempts"):
+            percent_correct = f"{q['percent_correct']:.0f}%"
+            avg_time = f"{q['avg_ms'] / 1000:.1f}s"
+        else:
+            percent_correct = avg_time = "-"
+        return (q["id"], q["category"], q["question"], question_type, answers_text, has_feedback,
+                q.get("attempts", 0), percent_correct, avg_time)
+    
+    def show_edit_question_form(self, question_id, on_saved=None):
+        self.run_in_background(self.db.get_question_by_id, question_id,
+                               on_done=lambda question_data: self.build_edit_question_form(question_id, question_data, on_saved),
+                               widget=self.current_frame)
+    
+    def build_edit_question_form(self, question_id, question_data, on_saved=None):
+        if not question_data:
+            messagebox.showerror("Error", "Question not found.")
+            return
+        
+        previous_frame = None
+        if on_saved:
+            previous_frame = self.current_frame
+            previous_frame.pack_forget()
+            self.current_frame = None
+        
+        frame = self.clear_current_frame()
+        
+        tk.Label(frame, text="Edit Question", font=("Arial", 18, "bold")).pack(pady=20)
+        
+        form_frame = tk.Frame(frame)
+        form_frame.pack(pady=10, fill=tk.X)
+        
+        tk.Label(form_frame, text="Category:", font=("Arial", 14)).grid(row=0, column=0, sticky=tk.W, pady=10)
+        tk.Label(form_frame, text=question_data["category"], font=("Arial", 14)).grid(row=0, column=1, pady=10, padx=5, sticky=tk.W)
+        
+        tk.Label(form_frame, text="Question:", font=("Arial", 14)).grid(row=1, column=0, sticky=tk.W, pady=10)
+        question_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
+        question_entry.insert(0, question_data["question"])
+        question_entry.grid(row=1, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
+        
+        multiple_choice_var = tk.BooleanVar(value=question_data["is_multiple_choice"])
+        tk.Checkbutton(form_frame, text="Multiple Correct Answers", font=("Arial", 14),
+                      variable=multiple_choice_var).grid(row=2, column=1, sticky=tk.W, pady=5)
+        
+        option_entries = []
+        option_vars = []
+        option_count = max(4, len(question_data["options"]))
+        
+        for i in range(option_count):
+            tk.Label(form_frame, text=f"Option {chr(65+i)}:", font=("Arial", 14)).grid(row=3+i, column=0, sticky=tk.W, pady=5)
+            option_entry = tk.Entry(form_frame, font=("Arial", 14), width=40)
+            
+            if i < len(question_data["options"]):
+                option_entry.insert(0, question_data["options"][i])
+                
+            option_entry.grid(row=3+i, column=1, pady=5, padx=5, sticky=tk.W+tk.E)
+            option_entries.append(option_entry)
+            
+            var = tk.BooleanVar()
+            if i < len(question_data["options"]) and question_data["options"][i] in question_data["answers"]:
+                var.set(True)
+            option_vars.append(var)
+            tk.Checkbutton(form_frame, text="Correct", variable=var).grid(row=3+i, column=2, padx=5)
+        
+        tk.Label(form_frame, text="Feedback:", font=("Arial", 14)).grid(row=3+option_count, column=0, sticky=tk.W, pady=10)
+        feedback_text = tk.Text(form_frame, font=("Arial", 12), width=40, height=5)
+        feedback_text.insert("1.0", question_data["feedback"])
+        feedback_text.grid(row=3+option_count, column=1, pady=10, padx=5, sticky=tk.W+tk.E)
+        tk.Label(form_frame, text="(Shown when answer is incorrect)", font=("Arial", 10, "italic")).grid(row=4+option_count, column=1, sticky=tk.W, pady=0)
+        
+        tk.Label(form_frame, text="Images:", font=("Arial", 14)).grid(row=5+option_count, column=0, sticky=tk.W, pady=10)
+        media_frame = tk.Frame(form_frame)
+        media_frame.grid(row=5+option_count, column=1, sticky=tk.W, pady=10, padx=5)
+        media_label = tk.Label(media_frame, font=("Arial", 12))
+        media_label.pack(side=tk.LEFT)
+        attachments = list(question_data.get("attachments", []))
+        
+        def show_attachments():
+            media_label.config(text=f"{len(attachments)} attached")
+        
+        def attach_image():
+            path = filedialog.askopenfilename(title="Attach Image",
+                                              filetypes=[("Images", "*.png *.gif *.jpg *.jpeg *.bmp"), ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                attachment_media_type(data)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Attach Failed", str(e))
+                return
+            
+            def image_attached(attachment_id):
+                attachments.append(attachment_id)
+                show_attachments()
+            
+            self.run_in_background(self.db.add_attachment, question_id, data, on_done=image_attached, widget=media_label)
+        
+        def remove_images():
+            if attachments and messagebox.askyesno("Remove Images", "Remove all images from this question?"):
+                def images_removed(result):
+                    attachments.clear()
+                    show_attachments()
+                
+                self.run_in_background(self.db.remove_attachments, question_id, on_done=images_removed, widget=media_label)
+        
+        tk.Button(media_frame, text="Attach Image...", command=attach_image).pack(side=tk.LEFT, padx=5)
+        tk.Button(media_frame, text="Remove All", command=remove_images).pack(side=tk.LEFT)
+        show_attachments()
+        
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=20)
+        
+        def save_question():
+            question_text = question_entry.get().strip()
+            options = filled_options(option_entries)
+            is_multiple_choice = multiple_choice_var.get()
+            feedback = feedback_text.get("1.0", tk.END).strip()
+            
+            if not question_text or len(options) < MIN_OPTIONS or "" in options:
+                messagebox.showerror("Error", "All fields must be filled (at least options A and B, leave unused options at the end empty).")
+                return
+            
+            correct_answers = []
+            for i, var in enumerate(option_vars[:len(options)]):
+                if var.get():
+                    correct_answers.append(options[i])
+            
+            if not correct_answers:
+                messagebox.showerror("Error", "Please select at least one correct answer.")
+                return
+            
+            if not is_multiple_choice and len(correct_answers) > 1:
+                messagebox.showerror("Error", "Single choice questions can only have one correct answer.")
+                return
+            
+            def question_saved(result):
+                messagebox.showinfo("Success", "Question updated successfully!")
+                close_form()
+                
+                if on_saved:
+                    on_saved(dict(question_data, question=question_text, options=options, answers=correct_answers,
+                                  is_multiple_choice=is_multiple_choice, feedback=feedback))
+            
+            self.run_in_background(self.db.update_question, question_id, question_text, options, correct_answers,
+                                   is_multiple_choice, feedback, on_done=question_saved, widget=frame)
+        
+        def close_form():
+            if previous_frame is None:
+                self.show_view_questions()
+                return
+            
+            frame.destroy()
+            previous_frame.pack(fill=tk.BOTH, expand=True)
+            self.current_frame = previous_frame
+        
+        tk.Button(button_frame, text="Save Changes", font=("Arial", 14),
+                  command=save_question, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(button_frame, text="Cancel", font=("Arial", 14),
+                  command=close_form, padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quiz application")
+    parser.add_argument("--instrument", action="store_true", help="record timings for the Diagnostics screen")
+    parser.add_argument("--db", default="quiz_database.db", help="database file to open or serve")
+    parser.add_argument("--server", metavar="URL", help="take quizzes from a quiz server instead of the database file")
+    parser.add_argument("--kiosk", action="store_true",
+                        help="copy the database into memory and write responses back to the file periodically")
+    parser.add_argument("--serve", metavar="HOST:PORT", nargs="?", const=f"0.0.0.0:{SERVER_PORT}",
+                        help=f"serve the database to other machines (default 0.0.0.0:{SERVER_PORT})")
+    parser.add_argument("--readers", type=int, default=SERVER_READERS, help="read connections used by the server")
+    parser.add_argument("--verbose", action="store_true", help="log every server request")
+    parser.add_argument("--export", metavar="PATH",
+                        help=f"write the questions to a .jsonl, .csv or {BUNDLE_EXTENSION} file and exit")
+    parser.add_argument("--category", help="only export or grade this category")
+    parser.add_argument("--duplicates", metavar="PATH", nargs="?", const="-",
+                        help="write a CSV report of near-duplicate questions (default: print it) and exit")
+    parser.add_argument("--grade", metavar="PATH",
+                        help="grade a .csv or .jsonl file of student,question_id,answers rows, write score reports and exit")
+    parser.add_argument("--workers", type=int, help="processes used by --grade (default: one per CPU)")
+    args = parser.parse_args()
+    
+    if args.grade:
+        with QuizDatabase(args.db) as db:
+            key = AnswerKey.from_database(db, args.category)
+        stem = os.path.splitext(args.grade)[0]
+        try:
+            start = time.perf_counter()
+            report = grade_submission_file(key, args.grade, args.workers)
+            elapsed = time.perf_counter() - start
+            write_grade_report(report, f"{stem}_students.csv", f"{stem}_items.csv")
+        except (ValueError, OSError) as e:
+            parser.exit(1, f"Grading failed: {e}\n")
+        print(f"Graded {report['answers']} answers from {len(report['students'])} students in {elapsed:.1f}s")
+        print(f"Wrote {stem}_students.csv and {stem}_items.csv")
+    elif args.duplicates:
+        with QuizDatabase(args.db) as db:
+            report = db.find_duplicate_questions()
+        if args.duplicates == "-":
+            write_duplicate_report(report, sys.stdout)
+        else:
+            with open(args.duplicates, "w", newline="", encoding="utf-8") as f:
+                write_duplicate_report(report, f)
+            print(f"Found {len(report)} groups of near-duplicate questions")
+    elif args.export:
+        with QuizDatabase(args.db) as db:
+            try:
+                exported = export_questions(db, args.export, args.category)
+            except (ValueError, OSError, sqlite3.Error) as e:
+                parser.exit(1, f"Export failed: {e}\n")
+        print(f"Exported {exported} questions to {args.export}")
+    elif args.serve:
+        from quiz_server import QuizServer
+        host, _, port = args.serve.rpartition(":")
+        server = QuizServer(args.db, host or "0.0.0.0", int(port), args.readers, args.verbose)
+        print(f"Serving {args.db} on port {server.httpd.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+    else:
+        root = load_tk().Tk()
+        if args.server:
+            db = RemoteQuizDatabase(args.server)
+        elif args.kiosk:
+            db = KioskDatabase(args.db)
+        else:
+            db = QuizDatabase(args.db)
+        app = QuizApp(root, Instrumentation() if Instrumentation.requested() else None, db)
+        root.mainloop()
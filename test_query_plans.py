@@ -0,0 +1,14 @@
+import itertools
+
+from benchmark import check_query_plans
+from test4 import INDEXED_QUERIES, ORDERED_QUERIES, QUESTION_ORDER_COLUMNS, question_page_sql
+
+
+def test_every_question_order_is_checked():
+    checked = {sql for sql, params in itertools.chain(INDEXED_QUERIES.values(), ORDERED_QUERIES.values())}
+    for order_by, descending, after in itertools.product(QUESTION_ORDER_COLUMNS, (False, True), (False, True)):
+        assert question_page_sql(order_by, descending, after) in checked
+
+
+def test_queries_avoid_full_scans(tmp_path):
+    assert check_query_plans(str(tmp_path)) == {}